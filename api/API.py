@@ -5,6 +5,7 @@ import pandas as pd
 import sklearn.linear_model as fit
 import plotly.express as px
 import math
+import os
 from importlib.machinery import SourceFileLoader
 
 # Load external analysis module
@@ -31,6 +32,10 @@ def round_sigfigs(value, sig_figs):
 # Load data
 df = pd.read_csv('data_interpolated.csv')
 
+# Fitted ARIMA/GP results persist on disk across sessions and reruns, next
+# to this script whatever directory the app is started from
+model_cache = analysis.ModelCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_cache.sqlite'))
+
 # Define metadata dictionaries for inputs and outputs
 year_dict = dict(
     display='Year',
@@ -96,6 +101,9 @@ inputs = dict(
 )
 outputs = dict(fac=fac_dict)
 
+# ARIMA reads the level (d=0) stationarity test of the output series; run it once
+analysis.PredictiveRegression().precompute_diagnostics(df, columns=[details['key'] for details in outputs.values()], max_d=0)
+
 # Utility function to retrieve input metadata by display name
 def get_input_by_display(display_value, inputs_dict):
     """
@@ -167,9 +175,25 @@ display_stats_mapping = {
             'aic'       : 'Akaike Information Criterion (AIC)',
             'std'       : 'Prediction standard deviation',
             'cv_score'  : 'Mean validation score',
-            'cv_error'  : 'Standard deviation of validation scores'
+            'cv_error'  : 'Standard deviation of validation scores',
+            'cv_pooled_r2' : 'Pooled out-of-fold $R^2$ value',
+            'cv_time'   : 'Cross-validation time (s)',
+            'cv_time_saved' : 'Estimated cross-validation time saved (s)',
+            'truncated' : 'Search stopped at the time limit (1 = yes)',
+            'n_fits'    : 'Number of models fitted',
+            'cv_loo_r2' : 'Leave-one-out $R^2$ value',
+            'cv_loo_nlpd' : 'Leave-one-out negative log predictive density',
+            'cv_loo_coverage' : 'Share of points inside the leave-one-out 95% interval',
+            'cv_lfo_r2' : 'Leave-future-out $R^2$ value',
+            'cv_lfo_nlpd' : 'Leave-future-out negative log predictive density',
+            'cv_lfo_coverage' : 'Share of points inside the leave-future-out 95% interval'
 }
 
+# Longest a single model search may run before returning its best model so far
+time_budget = 20.0
+# Longest a single ARIMA fit may run before the search moves on to the next order
+per_fit_seconds = 5.0
+
 
 if selected_input['display'] != "Year":
     # Define available analysis techniques for non-year inputs
@@ -178,6 +202,7 @@ if selected_input['display'] != "Year":
         "Autoregressive Integrated Moving Average (ARIMA)",
         "Polynomial Regression",
         "Linear Regression",
+        "Distributed Lag Regression",
         "Gaussian Process Regression"
     ]
 
@@ -188,7 +213,7 @@ if selected_input['display'] != "Year":
     )
 
     # Initialize the predictive regression class
-    tsr = analysis.PredictiveRegression()
+    tsr = analysis.PredictiveRegression(model_cache=model_cache)
     "Choose your model parameters."
     # Perform the selected analysis
     if analysis_choice == 'Locally Weighted Scatterplot Smoothing (LOWESS)':
@@ -198,15 +223,20 @@ if selected_input['display'] != "Year":
         maxp = st.slider("Select maximum order (number of time lags).", 1, 5, 3)
         maxd = st.slider("Select maximum degree of differencing (number of times the data have had past values subtracted).", 1, 5, 2)
         maxq = st.slider("Select maximum order of the moving-average mode.", 1, 5, 3)
-        results = tsr.arima_regression(df[selected_input['key']], df[selected_output['key']],max_p=maxp, max_d=maxd, max_q=maxq)
+        search = st.selectbox("Select order search.", ["Stepwise (fast)", "Exhaustive grid"])
+        results = tsr.arima_regression(df[selected_input['key']], df[selected_output['key']],max_p=maxp, max_d=maxd, max_q=maxq, time_budget=time_budget,
+                                       per_fit_seconds=per_fit_seconds, search='stepwise' if search == "Stepwise (fast)" else 'grid')
     elif analysis_choice == "Polynomial Regression":
         choice = st.slider("Select polynomial degree.", 3, 10, 3)
         results = tsr.polynomial_regression(df[selected_input['key']], df[selected_output['key']],degree=choice)
     elif analysis_choice == "Linear Regression":
         results = tsr.linear_regression(df[selected_input['key']], df[selected_output['key']])
+    elif analysis_choice == "Distributed Lag Regression":
+        choice = st.slider("Select maximum number of years of lagged input to include.", 0, 10, 6)
+        results = tsr.distributed_lag_regression(df[selected_input['key']], df[selected_output['key']], max_lag_years=choice)
     elif analysis_choice == "Gaussian Process Regression":
         choice = st.slider("Select length scale.", 1.0, 10.0, 1.0)
-        results = tsr.gaussian_process_regression(df[selected_input['key']], df[selected_output['key']],length_scale=choice)
+        results = tsr.gaussian_process_regression(df[selected_input['key']], df[selected_output['key']],length_scale=choice, cv_mode='analytic', time_budget=time_budget)
 
     # Prepare data for plotting the results
     plot_data = results['plot_data'].sort_values(by='X')
@@ -262,13 +292,18 @@ if selected_input['display'] != "Year":
         if not math.isnan(round_sigfigs(display_results[key], 3)):
             st.markdown(f"{key}: {round_sigfigs(display_results[key], 3)}")
 
+    # Block-permutation significance of the input/output relationship
+    perm = tsr.permutation_test(df[selected_input['key']], df[selected_output['key']])
+    st.markdown(f"Permutation test p-value (lag correlation): {round_sigfigs(perm['p_value_correlation'], 3)}")
+    st.markdown(f"Permutation test p-value (distributed lag $R^2$): {round_sigfigs(perm['p_value_r2'], 3)}")
+
 else:
     # Special case: Time series analysis for "Year" input
     analysis_techniques = ["Time Series Regression"]
     analysis_choice = "Time Series Regression"
     "Performing time series regression."
     # Initialize the predictive regression class
-    tsr = analysis.PredictiveRegression()
+    tsr = analysis.PredictiveRegression(model_cache=model_cache)
 
     # Perform time series regression
     if analysis_choice == 'Time Series Regression':
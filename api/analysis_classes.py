@@ -3,7 +3,19 @@ import numpy as np
 import pandas as pd
 from typing import Tuple, Dict, Union, List
 import itertools
+import functools
+import inspect
 import warnings
+import hashlib
+import os
+import pickle
+import threading
+import time
+import sqlite3
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Scikit-learn imports
 from sklearn.preprocessing import StandardScaler, PolynomialFeatures
@@ -13,10 +25,19 @@ from sklearn.metrics import r2_score, mean_squared_error
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.exceptions import ConvergenceWarning
 
+# Serializes CV model closures for worker processes
+import cloudpickle
+
+# Library versions are part of the persistent model-cache key
+import scipy
+import sklearn
+import statsmodels
+
 # Stats models
 from statsmodels.regression.linear_model import OLS
 from statsmodels.tools.tools import add_constant
-from statsmodels.tsa.stattools import adfuller
+from statsmodels.tsa.stattools import adfuller, kpss
+from statsmodels.tools.sm_exceptions import InterpolationWarning
 from statsmodels.tsa.arima.model import ARIMA
 # Non-parametric regression
 from statsmodels.nonparametric.smoothers_lowess import lowess
@@ -25,13 +46,722 @@ from statsmodels.nonparametric.smoothers_lowess import lowess
 from scipy import signal
 from scipy.stats import norm
 from scipy.fft import fft, fftfreq, ifft
+from scipy.optimize import minimize
+from scipy.linalg import cholesky, solve_triangular
 
 
 # Suppress specific warnings (optional)
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=ConvergenceWarning)
 
+# Process-pool workers live at module level so they can be pickled
+
+def _permutation_chunk(x_lagged, y, support, design_q, rows, block_length, n_perm, seed):
+    """
+    Scores one chunk of block permutations of y for permutation_test.
+    
+    Outputs:
+    tuple : (max_abs_corr, r2) arrays of shape (n_perm,)
+    """
+    rng = np.random.default_rng(seed)
+    m = len(support)
+    
+    # Random block order per permutation; a stable sort on each element's
+    # block rank keeps the original order inside every block
+    block_id = np.arange(m) // block_length
+    n_blocks = block_id[-1] + 1
+    block_rank = rng.random((n_perm, n_blocks)).argsort(axis=1).argsort(axis=1)
+    order = np.argsort(block_rank[:, block_id], axis=1, kind='stable')
+    
+    y_perm = np.full((n_perm, len(y)), np.nan)
+    y_perm[:, support] = y[support][order]
+    
+    # Largest absolute lag correlation per permutation
+    correlations, _ = PredictiveRegression()._masked_correlation(
+        x_lagged[np.newaxis, :, :], y_perm[:, np.newaxis, :]
+    )
+    max_abs_corr = np.nanmax(np.nan_to_num(np.abs(correlations), nan=-np.inf), axis=1)
+    
+    # Distributed-lag R^2 via the fixed design's orthonormal basis
+    y_rows = y_perm[:, rows]
+    y_rows = y_rows - y_rows.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = np.sum((y_rows @ design_q) ** 2, axis=1) / np.sum(y_rows ** 2, axis=1)
+    
+    return max_abs_corr, r2
+
+
+def _cv_fold(model_func, params, X_train, Y_train, X_val, Y_val):
+    """
+    Fits one cross-validation fold and returns its flattened predictions
+    for X_val. Exceptions propagate to the caller.
+    """
+    # Fit model
+    if 'X' in params and 'Y' in params:
+        model = model_func(**params)
+    else:
+        model = model_func(X=X_train, Y=Y_train)
+    
+    # Get predictions
+    if hasattr(model, 'predict'):
+        Y_pred = model.predict(X_val)
+    elif callable(model):
+        Y_pred = model(X_val)
+    else:
+        Y_pred = model.forecast(steps=len(X_val), exog=X_val)
+    
+    return np.array(Y_pred).reshape(-1)
+
+
+def _cv_fold_pickled(payload, X_train, Y_train, X_val, Y_val):
+    """
+    Process-pool entry point for _cv_fold. The model function arrives
+    cloudpickled (CV model functions are usually closures) and errors are
+    returned instead of raised so the caller can skip the fold.
+    
+    Outputs:
+    tuple : (Y_pred, None) on success, (None, error message) on failure
+    """
+    model_func, params = pickle.loads(payload)
+    try:
+        return _cv_fold(model_func, params, X_train, Y_train, X_val, Y_val), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _stationarity_tests(values):
+    """
+    ADF and KPSS (level-stationarity) tests of one series. Tests that cannot
+    run, e.g. on too few points, give NaN.
+    
+    Outputs:
+    dict : {'n', 'adf_stat', 'adf_pvalue', 'kpss_stat', 'kpss_pvalue'}
+    """
+    result = {'n': len(values), 'adf_stat': np.nan, 'adf_pvalue': np.nan,
+              'kpss_stat': np.nan, 'kpss_pvalue': np.nan}
+    try:
+        result['adf_stat'], result['adf_pvalue'] = adfuller(values)[:2]
+    except Exception:
+        pass
+    try:
+        # KPSS p-values are interpolated from a table and clipped at its ends
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', InterpolationWarning)
+            result['kpss_stat'], result['kpss_pvalue'] = kpss(values, regression='c', nlags='auto')[:2]
+    except Exception:
+        pass
+    return result
+
+
+def _rolling_origin_task(model, method, X_train, Y_train, n_steps, kwargs):
+    """
+    Fits one rolling-origin forecast. With n_steps=None the method's
+    next-period prediction is returned, otherwise its first n_steps
+    forecasts (for methods that forecast several periods from one fit,
+    from results['forecasts'] or the end of plot_data).
+    
+    Outputs:
+    tuple : (forecasts, None) on success, (None, error message) on failure
+    """
+    try:
+        results = getattr(model, method)(X_train, Y_train, do_cv=False, **kwargs)
+        if n_steps is None:
+            return np.array([results['prediction']], dtype=float), None
+        if 'forecasts' in results:
+            return np.asarray(results['forecasts'][:n_steps], dtype=float), None
+        return np.asarray(results['plot_data']['Y_pred'].iloc[-n_steps:], dtype=float), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _budgeted_lbfgs(obj_func, initial_theta, bounds, budget):
+    """
+    Gaussian process optimizer: the same L-BFGS-B run as scikit-learn's
+    default, but it stops at the budget's deadline, keeping its last iterate,
+    and does not start once the budget is spent.
+    """
+    if budget.expired():
+        budget.truncated = True
+        return initial_theta, obj_func(initial_theta, eval_gradient=False)
+    last = [initial_theta]
+    
+    def track(theta):
+        last[0] = theta
+        budget.check()
+    
+    try:
+        opt = minimize(obj_func, initial_theta, method="L-BFGS-B", jac=True,
+                       bounds=bounds, callback=track)
+        return opt.x, opt.fun
+    except BudgetExceeded:
+        return last[0], obj_func(last[0], eval_gradient=False)
+
+
+def _gp_optimizer_start(estimator, X, y, initial_theta, deadline):
+    """
+    Runs one start of the Gaussian process hyperparameter optimizer from
+    initial_theta (log-hyperparameters).
+    
+    Outputs:
+    tuple : (optimized theta, log marginal likelihood, whether the time
+             budget cut the start short, wall time in seconds)
+    """
+    start = time.perf_counter()
+    budget = TimeBudget(deadline=deadline)
+    estimator.kernel = estimator.kernel.clone_with_theta(initial_theta)
+    estimator.n_restarts_optimizer = 0
+    if deadline is not None:
+        estimator.optimizer = functools.partial(_budgeted_lbfgs, budget=budget)
+    estimator.fit(X, y)
+    return (estimator.kernel_.theta, estimator.log_marginal_likelihood_value_,
+            budget.truncated, time.perf_counter() - start)
+
+
+def _arima_grid_chunk(Y, X, orders, deadline, must_fit=False, per_fit_seconds=None):
+    """
+    Fits a chunk of the ARIMA order grid searched by arima_regression.
+    Failed fits, including fits whose Kalman filter broke down and assigns
+    no likelihood to any observation, get an AIC of NaN. Once the deadline (a time.monotonic()
+    value, or None) passes, the fit in progress is abandoned and the rest
+    of the chunk is skipped. A fit running longer than per_fit_seconds is
+    abandoned on its own (status 'timed out') and the chunk moves on to
+    the next order. With must_fit, the chunk's first successful fit always
+    completes so the search has a model to return.
+    
+    Outputs:
+    tuple : (aics, statuses, position of the chunk's best order or None,
+             its fitted model, whether the deadline cut the chunk short)
+    """
+    budget = TimeBudget(deadline=deadline)
+    aics = np.full(len(orders), np.nan)
+    statuses = ['skipped'] * len(orders)
+    best, best_model = None, None
+    
+    for i, order in enumerate(orders):
+        protected = must_fit and best_model is None
+        if not protected and budget.expired():
+            budget.truncated = True
+            break
+        # Abort fits that run past the search deadline or their own time
+        # limit once a fallback exists
+        fit_deadline = deadline
+        if per_fit_seconds is not None:
+            fit_end = time.monotonic() + per_fit_seconds
+            fit_deadline = fit_end if deadline is None else min(deadline, fit_end)
+        fit_budget = TimeBudget(deadline=fit_deadline)
+        fit_kwargs = {}
+        if not protected and fit_deadline is not None:
+            fit_kwargs['method_kwargs'] = {'callback': fit_budget.check}
+        try:
+            model = ARIMA(Y, exog=X, order=order).fit(**fit_kwargs)
+        except BudgetExceeded:
+            if budget.expired():
+                budget.truncated = True
+            else:
+                statuses[i] = 'timed out'
+            continue
+        except Exception:
+            statuses[i] = 'failed'
+            continue
+        if not np.any(model.llf_obs):
+            statuses[i] = 'failed'
+            continue
+        
+        aics[i] = model.aic
+        statuses[i] = 'fitted'
+        # Strict comparison keeps the earliest order on ties
+        if model.aic < (aics[best] if best is not None else np.inf):
+            best, best_model = i, model
+    
+    return aics, statuses, best, best_model, budget.truncated
+
+
+class AlignedPair:
+    """
+    Lag-aligned X/Y observations backed by NumPy arrays.
+    
+    Attributes:
+    X     : float array of input values, X[t - lag] paired with Y[t]
+    Y     : float array of output values, (n,) or (n, n_targets)
+    index : labels (years or row numbers) of the Y observations
+    lag   : lag that X was shifted by
+    
+    The arrays are read-only views wherever the aligned span has no
+    interior gaps, so pairs can be shared through the lag cache and sliced
+    per fold without copying. pandas objects are only built by to_frame.
+    """
+    __slots__ = ('X', 'Y', 'index', 'lag')
+
+    def __init__(self, X, Y, index, lag=0):
+        self.X = X
+        self.Y = Y
+        self.index = index
+        self.lag = lag
+        for arr in (self.X, self.Y, self.index):
+            arr.setflags(write=False)
+
+    def __len__(self):
+        return len(self.Y)
+
+    def __getitem__(self, idx):
+        return AlignedPair(self.X[idx], self.Y[idx], self.index[idx], self.lag)
+
+    def column(self, j):
+        """
+        Returns the single-target pair for column j of a 2-D Y.
+        """
+        return AlignedPair(self.X, self.Y[:, j], self.index, self.lag)
+
+    def to_frame(self, **columns):
+        """
+        Builds the plot_data frame with X and Y_data plus any extra columns
+        (e.g. Y_pred, Y_std) given as keyword arrays.
+        """
+        data = {'X': self.X, 'Y_data': self.Y}
+        data.update(columns)
+        return pd.DataFrame(data, index=self.index)
+
+
+class MetricsAccumulator:
+    """
+    Mergeable running totals for the quantities behind _calculate_metrics.
+    
+    Observations are added chunk by chunk (CV folds, monthly batches,
+    parallel workers) with update(), and accumulators built separately can
+    be combined with merge(). The target mean and total sum of squares are
+    tracked Welford-style, so no residual arrays are kept.
+    """
+    __slots__ = ('n', 'mean', 'tss', 'rss', 'abs_err')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.tss = 0.0
+        self.rss = 0.0
+        self.abs_err = 0.0
+
+    def update(self, y_true, y_pred):
+        """
+        Adds a chunk of observations and returns the accumulator.
+        """
+        y_true = np.asarray(y_true, dtype=float).reshape(-1)
+        y_pred = np.asarray(y_pred, dtype=float).reshape(-1)
+        if len(y_true) == 0:
+            return self
+        
+        chunk = MetricsAccumulator()
+        chunk.n = len(y_true)
+        chunk.mean = float(np.mean(y_true))
+        chunk.tss = float(np.sum((y_true - chunk.mean) ** 2))
+        residuals = y_true - y_pred
+        chunk.rss = float(np.sum(residuals ** 2))
+        chunk.abs_err = float(np.sum(np.abs(residuals)))
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Folds another accumulator into this one (parallel Welford update)
+        and returns this accumulator.
+        """
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.tss += other.tss + delta ** 2 * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.rss += other.rss
+        self.abs_err += other.abs_err
+        self.n = n
+        return self
+
+    def result(self, n_params=0):
+        """
+        Returns r2, rmse, mae and aic for everything accumulated so far,
+        with the same definitions as _calculate_metrics. Metrics are NaN
+        when fewer than 2 points have been added.
+        """
+        if self.n < 2:
+            return {"r2": np.nan, "rmse": np.nan, "mae": np.nan, "aic": np.nan}
+        mse = self.rss / self.n
+        return {
+            "r2": 1 - (self.rss / self.tss) if self.tss != 0 else 0,
+            "rmse": np.sqrt(mse),
+            "mae": self.abs_err / self.n,
+            "aic": self.n * np.log(mse) + 2 * n_params
+        }
+
+
+class FoldPlan:
+    """
+    Precomputed expanding-window time-series folds.
+    
+    Attributes:
+    n         : number of aligned points
+    k_folds   : number of folds
+    test_size : validation points per fold
+    gap       : points left out between training and validation windows
+    split     : list of (train_idx, val_idx) read-only integer arrays
+    slices    : the same folds as (train, val) slice objects, so indexing
+                returns views
+    
+    Plans are built by fold_plan() and cached by (n, k_folds, test_size, gap),
+    so every regression method scores the same folds.
+    """
+    __slots__ = ('n', 'k_folds', 'test_size', 'gap', 'split', 'slices')
+
+    def __init__(self, n, k_folds=5, test_size=None, gap=0):
+        if test_size is None:
+            test_size = max(2, n // (k_folds + 1))
+        self.n = n
+        self.k_folds = k_folds
+        self.test_size = test_size
+        self.gap = gap
+        
+        tscv = TimeSeriesSplit(n_splits=k_folds, test_size=test_size, gap=gap)
+        self.split = []
+        self.slices = []
+        for train_idx, val_idx in tscv.split(np.empty((n, 1))):
+            train_idx.setflags(write=False)
+            val_idx.setflags(write=False)
+            self.split.append((train_idx, val_idx))
+            self.slices.append((
+                slice(int(train_idx[0]), int(train_idx[-1]) + 1),
+                slice(int(val_idx[0]), int(val_idx[-1]) + 1)
+            ))
+
+    def __len__(self):
+        return len(self.split)
+
+    def __iter__(self):
+        return iter(self.split)
+
+
+@functools.lru_cache(maxsize=128)
+def fold_plan(n, k_folds=5, test_size=None, gap=0):
+    """
+    Returns the cached FoldPlan for n points. The default test_size,
+    max(2, n // (k_folds + 1)), is shared by every regression method.
+    """
+    return FoldPlan(n, k_folds, test_size, gap)
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised from an optimizer callback when a fit runs past its TimeBudget.
+    """
+
+
+class TimeBudget:
+    """
+    Wall-clock budget shared by all fits of one model search.
+    
+    Attributes:
+    seconds   : budget in seconds (None never expires)
+    deadline  : time.monotonic() value at which the budget runs out; the
+                clock is system-wide, so worker processes can share it
+    truncated : set once a fit or search step was cut short by the budget
+    """
+    __slots__ = ('seconds', 'deadline', 'truncated')
+
+    def __init__(self, seconds=None, deadline=None):
+        self.seconds = seconds
+        if deadline is None and seconds is not None:
+            deadline = time.monotonic() + seconds
+        self.deadline = deadline
+        self.truncated = False
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def check(self, *args):
+        """
+        Optimizer callback that aborts the current fit once the deadline passes.
+        """
+        if self.expired():
+            self.truncated = True
+            raise BudgetExceeded()
+
+
+class SparseGaussianProcessRegressor:
+    """
+    Inducing-point Gaussian process (Titsias' variational sparse GP) with the
+    fit/predict interface of scikit-learn's GaussianProcessRegressor. The
+    kernel hyperparameters maximize the collapsed variational bound on the
+    log marginal likelihood, which costs O(n m^2) for n points and m inducing
+    points instead of O(n^3).
+    
+    Attributes:
+    kernel               : Sum of a noise-free kernel and a WhiteKernel
+    n_inducing           : number of inducing points, placed at evenly spaced
+                           quantiles of the first input column
+    optimizer            : "fmin_l_bfgs_b", a callable with scikit-learn's
+                           optimizer signature, or None to keep the kernel
+    n_restarts_optimizer : extra optimizer starts drawn log-uniformly from
+                           the hyperparameter bounds
+    random_state         : seed for the restart draws
+    """
+
+    def __init__(self, kernel, n_inducing=64, optimizer="fmin_l_bfgs_b",
+                 n_restarts_optimizer=0, random_state=None):
+        self.kernel = kernel
+        self.n_inducing = n_inducing
+        self.optimizer = optimizer
+        self.n_restarts_optimizer = n_restarts_optimizer
+        self.random_state = random_state
+
+    def _factorize(self, kernel, X, y):
+        # Cholesky factors of K_mm and of I + A A^T with A = L_m^-1 K_mn / sigma
+        signal_kernel, noise = kernel.k1, kernel.k2.noise_level
+        K_mm = signal_kernel(self.inducing_points_)
+        K_mm[np.diag_indices_from(K_mm)] += 1e-6 * np.mean(np.diag(K_mm))
+        L_m = cholesky(K_mm, lower=True)
+        A = solve_triangular(L_m, signal_kernel(self.inducing_points_, X), lower=True) / np.sqrt(noise)
+        B = A @ A.T
+        B[np.diag_indices_from(B)] += 1.0
+        L_B = cholesky(B, lower=True)
+        c = solve_triangular(L_B, A @ y, lower=True) / np.sqrt(noise)
+        return L_m, L_B, A, c
+
+    def _bound(self, theta, X, y):
+        kernel = self.kernel_.clone_with_theta(theta)
+        noise = kernel.k2.noise_level
+        try:
+            L_m, L_B, A, c = self._factorize(kernel, X, y)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        n = len(y)
+        return (-0.5 * n * np.log(2 * np.pi * noise)
+                - np.sum(np.log(np.diag(L_B)))
+                - 0.5 * (y @ y) / noise + 0.5 * (c @ c)
+                - 0.5 * np.sum(kernel.k1.diag(X)) / noise + 0.5 * np.sum(A * A))
+
+    def log_marginal_likelihood(self, theta, eval_gradient=False):
+        """
+        Collapsed variational lower bound on the log marginal likelihood of
+        the training data at log-hyperparameters theta; the gradient is
+        taken by central differences.
+        """
+        theta = np.asarray(theta, dtype=float)
+        value = self._bound(theta, self.X_train_, self.y_train_)
+        if not eval_gradient:
+            return value
+        step = 1e-5
+        grad = np.empty_like(theta)
+        for i in range(len(theta)):
+            shift = np.zeros_like(theta)
+            shift[i] = step
+            upper = self._bound(theta + shift, self.X_train_, self.y_train_)
+            lower = self._bound(theta - shift, self.X_train_, self.y_train_)
+            grad[i] = (upper - lower) / (2 * step)
+        if not np.all(np.isfinite(grad)):
+            grad = np.zeros_like(theta)
+        return value, grad
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).reshape(-1)
+        self.X_train_, self.y_train_ = X, y
+        
+        # Inducing points at evenly spaced quantiles of the inputs
+        order = np.argsort(X[:, 0], kind='stable')
+        if len(X) > self.n_inducing:
+            order = order[np.linspace(0, len(X) - 1, self.n_inducing).round().astype(int)]
+        self.inducing_points_ = X[order]
+        
+        self.kernel_ = self.kernel.clone_with_theta(self.kernel.theta)
+        if self.optimizer is not None:
+            def obj_func(theta, eval_gradient=True):
+                if eval_gradient:
+                    value, grad = self.log_marginal_likelihood(theta, eval_gradient=True)
+                    return -value, -grad
+                return -self.log_marginal_likelihood(theta)
+            
+            def run(initial_theta, bounds):
+                if callable(self.optimizer):
+                    return self.optimizer(obj_func, initial_theta, bounds)
+                opt = minimize(obj_func, initial_theta, method="L-BFGS-B", jac=True, bounds=bounds)
+                return opt.x, opt.fun
+            
+            # Same restart scheme as GaussianProcessRegressor
+            bounds = self.kernel_.bounds
+            optima = [run(self.kernel_.theta, bounds)]
+            rng = np.random.RandomState(self.random_state)
+            for _ in range(self.n_restarts_optimizer):
+                optima.append(run(rng.uniform(bounds[:, 0], bounds[:, 1]), bounds))
+            theta, value = min(optima, key=lambda optimum: optimum[1])
+            self.kernel_ = self.kernel_.clone_with_theta(theta)
+            self.log_marginal_likelihood_value_ = -value
+        else:
+            self.log_marginal_likelihood_value_ = self.log_marginal_likelihood(self.kernel_.theta)
+        
+        self._L_m, self._L_B, _, self._c = self._factorize(self.kernel_, X, y)
+        return self
+
+    def predict(self, X, return_std=False):
+        X = np.asarray(X, dtype=float)
+        W = solve_triangular(self._L_m, self.kernel_.k1(self.inducing_points_, X), lower=True)
+        V = solve_triangular(self._L_B, W, lower=True)
+        mean = V.T @ self._c
+        if not return_std:
+            return mean
+        # Predictive variance includes the fitted noise, as in scikit-learn
+        var = self.kernel_.diag(X) - np.sum(W * W, axis=0) + np.sum(V * V, axis=0)
+        return mean, np.sqrt(np.clip(var, 0.0, None))
+
+
+class ModelCache:
+    """
+    Persistent store of fitted model results in a SQLite file, so identical
+    requests from any session or process skip fitting. Entries are pickled
+    results dicts; once their total size exceeds max_bytes the least
+    recently used entries are evicted.
+    
+    Attributes:
+    path      : SQLite database file
+    max_bytes : size cap on the stored entries
+    """
+
+    def __init__(self, path='model_cache.sqlite', max_bytes=256 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        with self._transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS models ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS models_last_used ON models (last_used)")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # A connection per operation keeps the cache usable from any thread
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key):
+        """
+        Returns the stored results for key, or None if there are none.
+        """
+        with self._transaction() as db:
+            row = db.execute("SELECT value FROM models WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                value = pickle.loads(row[0])
+            except Exception:
+                # Unreadable entries are dropped and refitted
+                db.execute("DELETE FROM models WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE models SET last_used = ? WHERE key = ?", (time.time(), key))
+        return value
+
+    def put(self, key, value):
+        """
+        Stores results under key and evicts least recently used entries
+        beyond max_bytes. Entries larger than the cap are not stored.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO models (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM models").fetchone()[0]
+            if total > self.max_bytes:
+                stale = []
+                for old_key, size in db.execute("SELECT key, size FROM models ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((old_key,))
+                    total -= size
+                db.executemany("DELETE FROM models WHERE key = ?", stale)
+
+    def info(self):
+        """
+        Reports cache usage.
+        
+        Outputs:
+        dict : {'entries', 'bytes', 'max_bytes'}
+        """
+        with self._transaction() as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM models").fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """
+        Removes every stored entry.
+        """
+        with self._transaction() as db:
+            db.execute("DELETE FROM models")
+
+
 class PredictiveRegression:
+    # Lag-search cache shared by every instance, since the Streamlit app
+    # builds a new PredictiveRegression on each rerun
+    lag_cache_size = 64
+    _lag_cache = OrderedDict()
+    _lag_cache_stats = {'hits': 0, 'misses': 0}
+    _lag_cache_lock = threading.Lock()
+    
+    # Unit-root/stationarity test results, keyed by series values and
+    # differencing order and shared the same way
+    diagnostics_cache_size = 256
+    _diagnostics_cache = OrderedDict()
+    _diagnostics_cache_stats = {'hits': 0, 'misses': 0}
+    _diagnostics_cache_lock = threading.Lock()
+
+    def __init__(self, n_jobs=1, executor=None, model_cache=None):
+        """
+        Inputs:
+        n_jobs      : worker processes for cross-validation folds (1 runs
+                      folds in-process, None or -1 uses every core)
+        executor    : optional concurrent.futures executor used for the folds
+                      instead of creating a process pool
+        model_cache : optional ModelCache holding fitted ARIMA and GP results
+                      across sessions
+        """
+        self.n_jobs = n_jobs
+        self.executor = executor
+        self.model_cache = model_cache
+
+    def __getstate__(self):
+        # Executors cannot be pickled; workers run their folds in-process
+        state = self.__dict__.copy()
+        state['executor'] = None
+        state['n_jobs'] = 1
+        return state
+
+    def _map_parallel(self, func, tasks, n_jobs=1, executor=None):
+        """
+        Applies func to each argument tuple in tasks and returns the results
+        in task order.
+        Inputs:
+        func     : picklable (module-level) function
+        tasks    : list of argument tuples
+        n_jobs   : number of worker processes (1 runs in-process,
+                   None or -1 uses every core)
+        executor : optional concurrent.futures executor to use instead of
+                   creating a process pool
+        
+        Outputs:
+        list     : func(*task) for every task, in order
+        """
+        if executor is None and (n_jobs is None or n_jobs < 0):
+            n_jobs = os.cpu_count() or 1
+        if executor is None and (n_jobs == 1 or len(tasks) <= 1):
+            return [func(*task) for task in tasks]
+        
+        if executor is not None:
+            return list(executor.map(func, *zip(*tasks)))
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            return list(pool.map(func, *zip(*tasks)))
+
     def _calculate_metrics(self, y_true, y_pred, n_params=0):
         """
         Calculates standardized error metrics for model evaluation.
@@ -98,214 +828,1192 @@ class PredictiveRegression:
         # Uses trace of smoothing matrix as effective parameters
         return n * np.log(rss/n) + 2 * effective_params
     
+    def _calculate_metrics_batch(self, y_true, y_pred, n_params=0):
+        """
+        Batched version of _calculate_metrics that scores many models at once.
+        The AIC is the same formula used by _calculate_non_parametric_aic, so
+        pass effective degrees of freedom as n_params for non-parametric models.
+        Inputs:
+        y_true    : actual values, shape (n_points,) or broadcastable to y_pred
+        y_pred    : predicted values, shape (n_models, n_points)
+        n_params  : number of parameters per model, scalar or shape (n_models,)
+        
+        Points where y_true or y_pred is NaN are left out of that model's score.
+        
+        Outputs:
+        dict      : arrays of shape (n_models,) with the standard error metrics
+            - r2   : R-squared value
+            - rmse : Root Mean Square Error
+            - mae  : Mean Absolute Error
+            - aic  : Akaike Information Criterion
+            - n    : number of points scored
+            Models with fewer than 2 scored points get NaN metrics.
+        """
+        y_pred = np.asarray(y_pred, dtype=float)
+        y_true = np.broadcast_to(np.asarray(y_true, dtype=float), y_pred.shape)
+        n_params = np.asarray(n_params, dtype=float)
+        
+        mask = ~np.isnan(y_true) & ~np.isnan(y_pred)
+        n = mask.sum(axis=-1)
+        residuals = np.where(mask, y_true - y_pred, 0.0)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # RSS and per-model mean of the scored targets
+            rss = np.sum(residuals ** 2, axis=-1)
+            y_mean = np.sum(np.where(mask, y_true, 0.0), axis=-1, keepdims=True) / n[..., np.newaxis]
+            tss = np.sum(np.where(mask, y_true - y_mean, 0.0) ** 2, axis=-1)
+            
+            r2 = np.where(tss != 0, 1 - rss / tss, 0.0)
+            rmse = np.sqrt(rss / n)
+            mae = np.sum(np.abs(residuals), axis=-1) / n
+            aic = n * np.log(rss / n) + 2 * n_params
+        
+        too_few = n < 2
+        return {
+            "r2": np.where(too_few, np.nan, r2),
+            "rmse": np.where(too_few, np.nan, rmse),
+            "mae": np.where(too_few, np.nan, mae),
+            "aic": np.where(too_few, np.nan, aic),
+            "n": n
+        }
+    
+    def _calculate_metrics_chunked(self, chunks, n_params=0):
+        """
+        Calculates the _calculate_metrics dictionary over a long series
+        supplied as an iterable of (y_true, y_pred) chunks, without
+        materializing the full residual array.
+        Inputs:
+        chunks    : iterable of (y_true, y_pred) array pairs
+        n_params  : number of model parameters for AIC calculation
+        
+        Outputs:
+        dict      : r2, rmse, mae and aic, as in _calculate_metrics
+        """
+        accumulator = MetricsAccumulator()
+        for y_true, y_pred in chunks:
+            accumulator.update(y_true, y_pred)
+        if accumulator.n < 2:
+            raise ValueError("Need at least 2 points to calculate metrics")
+        return accumulator.result(n_params)
+    
     def clean_series(self, X, Y):
         """
         Aligns two time series based on shared valid data points.
         
         Inputs:
-        X           : yearly time series data
-        Y           : yearly time series data
+        X           : yearly time series data
+        Y           : yearly time series data
+        
+        Outputs:
+        tuple       : (X_aligned, Y_aligned)
+        """
+        if not isinstance(X, pd.Series):
+            X = pd.Series(X)
+        if not isinstance(Y, pd.Series):
+            Y = pd.Series(Y)
+        
+        # Get overlapping indices where both series have valid data
+        valid_indices = X.notna() & Y.notna()
+        
+        # Return aligned series with only valid data points
+        return X[valid_indices], Y[valid_indices]
+
+    def align_with_lag(self, X, Y, lag):
+        """
+        Aligns two time series based on a given lag value.
+        
+        Inputs:
+        X    : yearly time series data
+        Y    : yearly time series data
+        lag  : integer lag value to shift X backwards
+        
+        Outputs:
+        tuple: (X_aligned, Y_aligned) where X is shifted back by lag periods
+        """
+        if not isinstance(X, pd.Series):
+            X = pd.Series(X)
+        if not isinstance(Y, pd.Series):
+            Y = pd.Series(Y)
+        
+        pair = self._align_arrays(X, Y, lag)
+        return (pd.Series(pair.X, index=pair.index, name=X.name),
+                pd.Series(pair.Y, index=pair.index, name=Y.name))
+
+    def _as_targets(self, Y):
+        """
+        Returns a 2-D array of targets as a DataFrame with one column per
+        target (columns 0..k-1, default index, as for 1-D arrays), so it
+        takes the multi-target path; other inputs are returned unchanged.
+        """
+        if isinstance(Y, np.ndarray) and Y.ndim == 2:
+            return pd.DataFrame(Y)
+        return Y
+
+    def _lag_grid(self, X, Y):
+        """
+        Places two series on a shared, gap-free index so that a lag of k
+        corresponds to a shift of k array positions.
+        
+        Inputs:
+        X    : yearly time series data
+        Y    : yearly time series data, or a DataFrame with one column per target
+        
+        Outputs:
+        tuple: (x, y, index) float arrays (NaN where missing) and their index;
+               y is (n, n_targets) when Y is a DataFrame
+        """
+        if not isinstance(X, pd.Series):
+            X = pd.Series(X)
+        if not isinstance(Y, (pd.Series, pd.DataFrame)):
+            Y = pd.Series(Y)
+        
+        index = X.index.union(Y.index)
+        if pd.api.types.is_integer_dtype(index) and len(index) > 0:
+            index = pd.RangeIndex(index.min(), index.max() + 1)
+        
+        x = X.reindex(index).to_numpy(dtype=float)
+        y = Y.reindex(index).to_numpy(dtype=float)
+        return x, y, index
+
+    def _correlogram(self, x, y, max_lag_years):
+        """
+        Computes the correlation between x[t - lag] and y[t] for every lag
+        in 0..max_lag_years in a single vectorized pass.
+        
+        Inputs:
+        x             : float array (..., n) on the shared lag grid, NaN where missing
+        y             : float array (..., n) broadcastable against x
+        max_lag_years : largest lag to evaluate
+        
+        Outputs:
+        tuple         : (correlations, counts)
+        correlations  : array (..., max_lag_years + 1), NaN where undefined
+        counts        : number of valid pairs behind each correlation
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        
+        # Standardize series so the running sums stay well conditioned
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x = (x - np.nanmean(x, axis=-1, keepdims=True)) / (np.nanstd(x, axis=-1, keepdims=True) + 1e-10)
+            y = (y - np.nanmean(y, axis=-1, keepdims=True)) / (np.nanstd(y, axis=-1, keepdims=True) + 1e-10)
+        
+        x_lagged = self._lag_windows(x, max_lag_years)
+        return self._masked_correlation(x_lagged, y[..., np.newaxis, :])
+
+    def _lag_windows(self, x, max_lag_years):
+        """
+        Stacks x shifted forward by 0..max_lag_years positions.
+        
+        Inputs:
+        x             : float array (..., n) on the shared lag grid
+        max_lag_years : largest lag
+        
+        Outputs:
+        np.ndarray    : array (..., max_lag_years + 1, n) whose row `lag` holds
+                        x[t - lag] at position t (NaN before the series starts).
+                        It is a strided view of one padded array, not a set of copies.
+        """
+        n = x.shape[-1]
+        pad = np.full(x.shape[:-1] + (max_lag_years,), np.nan)
+        padded = np.concatenate([pad, x], axis=-1)
+        return sliding_window_view(padded, n, axis=-1)[..., ::-1, :]
+
+    def _masked_correlation(self, x, y):
+        """
+        Pearson correlation along the last axis using only positions where
+        both arrays are valid.
+        
+        Inputs:
+        x, y  : broadcastable float arrays (..., n), NaN where missing
+        
+        Outputs:
+        tuple : (correlations, counts), NaN where fewer than 2 pairs
+                or a constant window make the correlation undefined
+        """
+        mask = ~np.isnan(x) & ~np.isnan(y)
+        xs = np.where(mask, x, 0.0)
+        ys = np.where(mask, y, 0.0)
+        counts = mask.sum(axis=-1)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sx = xs.sum(axis=-1)
+            sy = ys.sum(axis=-1)
+            cov = (xs * ys).sum(axis=-1) - sx * sy / counts
+            var_x = (xs * xs).sum(axis=-1) - sx ** 2 / counts
+            var_y = (ys * ys).sum(axis=-1) - sy ** 2 / counts
+            correlations = cov / np.sqrt(var_x * var_y)
+        
+        # Correlation is undefined for fewer than 2 pairs or a constant window
+        undefined = (counts < 2) | (var_x <= 1e-12 * counts) | (var_y <= 1e-12 * counts)
+        correlations = np.where(undefined, np.nan, np.clip(correlations, -1.0, 1.0))
+        
+        return correlations, counts
+
+    def _pair_from_grid(self, x, y, index, lag):
+        """
+        Aligns grid arrays from _lag_grid at a given lag.
+        
+        Inputs:
+        x, y  : float arrays on the shared lag grid, NaN where missing
+                (y may be (n, n_targets))
+        index : labels of the grid positions
+        lag   : integer lag value to shift x backwards
+        
+        Outputs:
+        AlignedPair : valid (x[t - lag], y[t]) pairs labelled by t
+        """
+        n = len(y)
+        if lag >= n:
+            return AlignedPair(np.empty(0), y[:0].copy(), np.asarray(index[:0]), lag)
+        
+        # Views pairing x[t - lag] with y[t]
+        x_lagged = x[:n - lag]
+        y_aligned = y[lag:]
+        labels = np.asarray(index[lag:])
+        
+        # With several targets a year is kept only if every target is observed
+        y_valid = ~np.isnan(y_aligned)
+        if y_valid.ndim == 2:
+            y_valid = y_valid.all(axis=1)
+        valid = ~np.isnan(x_lagged) & y_valid
+        positions = np.flatnonzero(valid)
+        if len(positions) == 0:
+            return AlignedPair(np.empty(0), y_aligned[:0].copy(), labels[:0], lag)
+        
+        # Contiguous overlap (the usual case) stays a zero-copy slice
+        first, last = positions[0], positions[-1] + 1
+        if last - first == len(positions):
+            keep = slice(first, last)
+        else:
+            keep = valid
+        return AlignedPair(x_lagged[keep], y_aligned[keep], labels[keep], lag)
+
+    def _align_arrays(self, X, Y, lag):
+        """
+        Array-backed counterpart of align_with_lag.
+        
+        Inputs:
+        X    : yearly time series data
+        Y    : yearly time series data
+        lag  : integer lag value to shift X backwards
+        
+        Outputs:
+        AlignedPair : aligned observations where X is shifted back by lag periods
+        """
+        x, y, index = self._lag_grid(X, Y)
+        return self._pair_from_grid(x, y, index, lag)
+
+    def max_lag(self, X, Y, max_lag_years=6, return_correlogram=False):
+        """
+        Finds the lag that maximizes correlation between two time series.
+        
+        Inputs:
+        X                  : yearly time series data
+        Y                  : yearly time series data
+        max_lag_years      : maximum number of years to check for lag
+        return_correlogram : whether to also return the correlation at every lag
+        
+        Outputs:
+        tuple           : (optimal_lag, max_correlation, metrics[, correlogram])
+        optimal_lag     : lag that maximizes correlation
+        max_correlation : correlation value at optimal lag
+        metrics        : evaluation metrics at optimal lag
+        correlogram     : pandas Series of correlations indexed by lag
+                          (only if return_correlogram=True)
+        """
+        if max_lag_years < 0:
+            raise ValueError("max_lag_years must be non-negative")
+        
+        # Shared grid and the points where both series have valid data
+        x, y, index = self._lag_grid(X, Y)
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        
+        if np.count_nonzero(valid) < 2:
+            raise ValueError("Insufficient valid data points in series")
+        
+        # Correlation at every lag in one pass
+        correlations, _ = self._correlogram(x, y, max_lag_years)
+        correlogram = pd.Series(
+            correlations,
+            index=pd.RangeIndex(max_lag_years + 1, name='lag'),
+            name='correlation'
+        )
+        
+        if np.all(np.isnan(correlations)):
+            # If no valid correlations found, return lag 0
+            metrics = self._calculate_metrics(y[valid], x[valid], n_params=1)
+            if return_correlogram:
+                return 0, 0, metrics, correlogram
+            return 0, 0, metrics
+        
+        # Find optimal lag (first lag wins ties)
+        optimal_lag = int(np.nanargmax(np.abs(correlations)))
+        max_correlation = correlations[optimal_lag]
+        
+        # Calculate metrics at optimal lag
+        pair = self._pair_from_grid(x, y, index, optimal_lag)
+        metrics = self._calculate_metrics(pair.Y, pair.X, n_params=1)
+        
+        if return_correlogram:
+            return optimal_lag, max_correlation, metrics, correlogram
+        return optimal_lag, max_correlation, metrics
+
+    def max_lag_bootstrap(self, X, Y, max_lag_years=6, n_boot=1000, block_length=None,
+                          ci=0.95, random_state=42):
+        """
+        Block-bootstrap uncertainty for the max_lag search.
+        
+        The years of Y are resampled in moving blocks (to keep the
+        autocorrelation within each block) and every resample is paired with
+        X at each lag, so all n_boot x (max_lag_years + 1) correlations come
+        from one index matrix and one vectorized pass.
+        
+        Inputs:
+        X             : yearly time series data
+        Y             : yearly time series data
+        max_lag_years : maximum number of years to check for lag
+        n_boot        : number of bootstrap resamples
+        block_length  : length of resampled blocks (default: n ** (1/3))
+        ci            : confidence level of the percentile intervals
+        random_state  : seed for the resampling
+        
+        Outputs:
+        dict    : {
+            'lag'              : optimal lag on the original data,
+            'correlation'      : correlation at that lag,
+            'correlogram'      : pandas DataFrame indexed by lag with columns
+                                 correlation, ci_lower, ci_upper,
+            'lag_distribution' : pandas Series with the share of resamples
+                                 selecting each lag,
+            'n_boot'           : number of resamples,
+            'block_length'     : block length used
+        }
+        """
+        if max_lag_years < 0:
+            raise ValueError("max_lag_years must be non-negative")
+        if n_boot < 1:
+            raise ValueError("n_boot must be positive")
+        
+        optimal_lag, max_correlation, _, correlogram = self.max_lag(
+            X, Y, max_lag_years, return_correlogram=True
+        )
+        
+        # Standardized grid arrays and the lagged X stack (max_lag + 1, n)
+        x, y, _ = self._lag_grid(X, Y)
+        x = (x - np.nanmean(x)) / (np.nanstd(x) + 1e-10)
+        y = (y - np.nanmean(y)) / (np.nanstd(y) + 1e-10)
+        x_lagged = self._lag_windows(x, max_lag_years)
+        
+        # Years that can be paired with X at one or more lags
+        support = np.flatnonzero(~np.isnan(y) & (~np.isnan(x_lagged)).any(axis=0))
+        m = len(support)
+        if block_length is None:
+            block_length = max(1, int(round(m ** (1 / 3))))
+        block_length = int(min(max(block_length, 1), m))
+        
+        # Moving-block resamples as one (n_boot, m) index matrix
+        rng = np.random.default_rng(random_state)
+        n_blocks = -(-m // block_length)
+        starts = rng.integers(0, m - block_length + 1, size=(n_boot, n_blocks))
+        positions = (starts[:, :, np.newaxis] + np.arange(block_length)).reshape(n_boot, -1)[:, :m]
+        resampled = support[positions]
+        
+        # Correlations for every resample and lag: (n_boot, max_lag + 1)
+        boot_corr, _ = self._masked_correlation(
+            x_lagged[:, resampled].transpose(1, 0, 2),
+            y[resampled][:, np.newaxis, :]
+        )
+        
+        # Percentile intervals per lag
+        alpha = (1 - ci) / 2
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            lower, upper = np.nanquantile(boot_corr, [alpha, 1 - alpha], axis=0)
+        
+        # Lag selected by each resample
+        has_corr = ~np.all(np.isnan(boot_corr), axis=1)
+        selected = np.argmax(np.nan_to_num(np.abs(boot_corr[has_corr]), nan=-1.0), axis=1)
+        counts = np.bincount(selected, minlength=max_lag_years + 1)
+        
+        lags = pd.RangeIndex(max_lag_years + 1, name='lag')
+        return {
+            'lag': optimal_lag,
+            'correlation': max_correlation,
+            'correlogram': pd.DataFrame({
+                'correlation': correlogram.to_numpy(),
+                'ci_lower': lower,
+                'ci_upper': upper
+            }, index=lags),
+            'lag_distribution': pd.Series(
+                counts / max(counts.sum(), 1), index=lags, name='share'
+            ),
+            'n_boot': n_boot,
+            'block_length': block_length
+        }
+
+    def permutation_test(self, X, Y, max_lag_years=6, n_perm=999, block_length=None,
+                         n_jobs=1, random_state=42, chunk_size=250):
+        """
+        Block-permutation significance test for the relationship between X
+        and Y. Blocks of consecutive Y values are shuffled (keeping the
+        autocorrelation inside each block) while X stays fixed, so trending
+        inputs are compared against permuted series with similar structure.
+        
+        Two statistics are tested:
+        - the largest |correlation| over lags 0..max_lag_years, which accounts
+          for the lag search done by max_lag
+        - the R^2 of regressing Y on X at lags 0..max_lag_years jointly
+        
+        Inputs:
+        X             : yearly time series data
+        Y             : yearly time series data
+        max_lag_years : maximum number of years to check for lag
+        n_perm        : number of permutations
+        block_length  : length of permuted blocks (default: n ** (1/3))
+        n_jobs        : worker processes (1 runs in-process, None or -1 uses every core)
+        random_state  : seed; chunk seeds are spawned from it, so results do
+                        not depend on n_jobs
+        chunk_size    : permutations per task sent to a worker
+        
+        Outputs:
+        dict    : {
+            'lag'                 : optimal lag on the original data,
+            'correlation'         : correlation at that lag,
+            'p_value_correlation' : p-value of the max |correlation| statistic,
+            'r2'                  : distributed-lag R-squared on the original data,
+            'p_value_r2'          : p-value of the R-squared statistic,
+            'n_perm'              : number of permutations,
+            'block_length'        : block length used
+        }
+        """
+        if max_lag_years < 0:
+            raise ValueError("max_lag_years must be non-negative")
+        if n_perm < 1:
+            raise ValueError("n_perm must be positive")
+        
+        optimal_lag, max_correlation, _ = self.max_lag(X, Y, max_lag_years)
+        
+        # Standardized grid arrays and the lagged X stack (max_lag + 1, n)
+        x, y, _ = self._lag_grid(X, Y)
+        x = (x - np.nanmean(x)) / (np.nanstd(x) + 1e-10)
+        y = (y - np.nanmean(y)) / (np.nanstd(y) + 1e-10)
+        x_lagged = np.ascontiguousarray(self._lag_windows(x, max_lag_years))
+        
+        # Years of Y that take part in any lag pairing are permuted
+        support = np.flatnonzero(~np.isnan(y) & (~np.isnan(x_lagged)).any(axis=0))
+        m = len(support)
+        if m < 2:
+            raise ValueError("Insufficient valid data points in series")
+        if block_length is None:
+            block_length = max(1, int(round(m ** (1 / 3))))
+        block_length = int(min(max(block_length, 1), m))
+        
+        # Orthonormal basis of the centered distributed-lag design on the
+        # rows where every lag is observed
+        rows = np.flatnonzero(~np.isnan(y) & ~np.isnan(x_lagged).any(axis=0))
+        if len(rows) < max_lag_years + 3:
+            raise ValueError("Insufficient valid data points for distributed lag regression")
+        design = x_lagged[:, rows].T
+        design_q, _ = np.linalg.qr(design - design.mean(axis=0))
+        
+        # Observed statistics (a single block of length m leaves y unpermuted)
+        obs_corr, obs_r2 = _permutation_chunk(
+            x_lagged, y, support, design_q, rows, m, 1, 0
+        )
+        
+        # Permutations in fixed-size chunks with spawned seeds
+        sizes = [chunk_size] * (n_perm // chunk_size)
+        if n_perm % chunk_size:
+            sizes.append(n_perm % chunk_size)
+        seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+        tasks = [
+            (x_lagged, y, support, design_q, rows, block_length, size, seed)
+            for size, seed in zip(sizes, seeds)
+        ]
+        chunks = self._map_parallel(_permutation_chunk, tasks, n_jobs=n_jobs)
+        perm_corr = np.concatenate([chunk[0] for chunk in chunks])
+        perm_r2 = np.concatenate([chunk[1] for chunk in chunks])
+        
+        # One-sided p-values including the observed statistic
+        p_corr = (1 + np.sum(perm_corr >= obs_corr[0] - 1e-12)) / (n_perm + 1)
+        p_r2 = (1 + np.sum(perm_r2 >= obs_r2[0] - 1e-12)) / (n_perm + 1)
+        
+        return {
+            'lag': optimal_lag,
+            'correlation': max_correlation,
+            'p_value_correlation': float(p_corr),
+            'r2': float(obs_r2[0]),
+            'p_value_r2': float(p_r2),
+            'n_perm': n_perm,
+            'block_length': block_length
+        }
+
+    def _shared_lag(self, X, Y, max_lag_years=6):
+        """
+        Picks one lag for several targets so they can share an aligned
+        design: the lag with the largest mean |correlation| across targets,
+        from a single correlogram broadcast over the target columns.
+        
+        Inputs:
+        X             : yearly time series data
+        Y             : DataFrame with one column per target
+        max_lag_years : maximum number of years to check for lag
+        
+        Outputs:
+        int           : shared optimal lag (0 if no correlation is defined)
+        """
+        if max_lag_years < 0:
+            raise ValueError("max_lag_years must be non-negative")
+        
+        x, y, _ = self._lag_grid(X, Y)
+        correlations, _ = self._correlogram(x, y.T, max_lag_years)
+        if np.all(np.isnan(correlations)):
+            return 0
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            mean_abs = np.nanmean(np.abs(correlations), axis=0)
+        return int(np.nanargmax(mean_abs))
+
+    def _lag_cache_key(self, X, Y, max_lag_years):
+        """
+        Builds a content-addressed cache key for a lag search.
+        
+        Inputs:
+        X             : yearly time series data
+        Y             : yearly time series data
+        max_lag_years : maximum number of years checked for lag
+        
+        Outputs:
+        str           : hex digest of both series (values and index; column
+                        names for target frames) and max_lag_years
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for series in (X, Y):
+            if not isinstance(series, (pd.Series, pd.DataFrame)):
+                series = pd.Series(series)
+            if isinstance(series, pd.DataFrame):
+                # Target frames also key on their column names
+                digest.update(repr(list(series.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(series, index=True).to_numpy().tobytes())
+            digest.update(b'|')
+        digest.update(str(int(max_lag_years)).encode())
+        return digest.hexdigest()
+
+    def _best_lag_alignment(self, X, Y, max_lag_years=6, lag=None):
+        """
+        Finds the optimal lag and aligns the series at it, memoizing the
+        result in a bounded LRU cache shared by all regression methods.
+        
+        Inputs:
+        X             : yearly time series data
+        Y             : yearly time series data, or a DataFrame of targets
+                        (aligned at the lag from _shared_lag)
+        max_lag_years : maximum number of years to check for lag
+        lag           : fixed lag to align at instead of searching for one
+        
+        Outputs:
+        AlignedPair   : observations aligned at the optimal lag (pair.lag)
+        """
+        if lag is not None:
+            return self._align_arrays(X, Y, int(lag))
+        
+        key = self._lag_cache_key(X, Y, max_lag_years)
+        cls = PredictiveRegression
+        
+        with cls._lag_cache_lock:
+            if key in cls._lag_cache:
+                cls._lag_cache.move_to_end(key)
+                cls._lag_cache_stats['hits'] += 1
+                return cls._lag_cache[key]
+            cls._lag_cache_stats['misses'] += 1
+        
+        if isinstance(Y, pd.DataFrame):
+            best_lag = self._shared_lag(X, Y, max_lag_years)
+        else:
+            best_lag, _, _ = self.max_lag(X, Y, max_lag_years)
+        entry = self._align_arrays(X, Y, best_lag)
+        
+        with cls._lag_cache_lock:
+            cls._lag_cache[key] = entry
+            cls._lag_cache.move_to_end(key)
+            while len(cls._lag_cache) > cls.lag_cache_size:
+                cls._lag_cache.popitem(last=False)
+        
+        return entry
+
+    @classmethod
+    def lag_cache_info(cls):
+        """
+        Reports lag-search cache usage.
+        
+        Outputs:
+        dict : {'hits', 'misses', 'size', 'maxsize'}
+        """
+        with cls._lag_cache_lock:
+            return {
+                'hits': cls._lag_cache_stats['hits'],
+                'misses': cls._lag_cache_stats['misses'],
+                'size': len(cls._lag_cache),
+                'maxsize': cls.lag_cache_size
+            }
+
+    @classmethod
+    def clear_lag_cache(cls):
+        """
+        Invalidates the lag-search cache, e.g. after the dataset is reloaded.
+        Hit/miss counters are reset as well.
+        """
+        with cls._lag_cache_lock:
+            cls._lag_cache.clear()
+            cls._lag_cache_stats['hits'] = 0
+            cls._lag_cache_stats['misses'] = 0
+
+    def _model_cache_key(self, method, X, Y, lag, params):
+        """
+        Builds the persistent model-cache key for one fit.
+        
+        Inputs:
+        method : name of the regression method
+        X, Y   : the series passed to the method
+        lag    : lag the series were aligned at
+        params : dict of hyperparameters that affect the results
         
         Outputs:
-        tuple       : (X_aligned, Y_aligned)
+        str    : hex digest of the data, method, lag, hyperparameters and
+                 library versions
         """
-        if not isinstance(X, pd.Series):
-            X = pd.Series(X)
-        if not isinstance(Y, pd.Series):
-            Y = pd.Series(Y)
-        
-        # Get overlapping indices where both series have valid data
-        valid_indices = X.notna() & Y.notna()
-        
-        # Return aligned series with only valid data points
-        return X[valid_indices], Y[valid_indices]
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self._lag_cache_key(X, Y, 0).encode())
+        digest.update(repr((method, int(lag), sorted(params.items()))).encode())
+        versions = (np.__version__, pd.__version__, scipy.__version__,
+                    sklearn.__version__, statsmodels.__version__)
+        digest.update(repr(versions).encode())
+        return digest.hexdigest()
 
-    def align_with_lag(self, X, Y, lag):
+    def _diagnostics_key(self, values, d):
         """
-        Aligns two time series based on a given lag value.
+        Cache key for the stationarity tests of a series differenced d times.
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(values, dtype=float).tobytes(), digest_size=16)
+        return digest.hexdigest(), int(d)
+
+    def stationarity_diagnostics(self, series, d=0):
+        """
+        ADF and KPSS tests of a series after differencing it d times,
+        memoized per (series values, d) in a cache shared by all instances.
         
         Inputs:
-        X    : yearly time series data
-        Y    : yearly time series data
-        lag  : integer lag value to shift X backwards
+        series : yearly time series data (NaN values are dropped)
+        d      : differencing order
         
         Outputs:
-        tuple: (X_aligned, Y_aligned) where X is shifted back by lag periods
+        dict   : {'n', 'adf_stat', 'adf_pvalue', 'kpss_stat', 'kpss_pvalue'};
+                 ADF rejects a unit root at small adf_pvalue, KPSS rejects
+                 stationarity at small kpss_pvalue
         """
-        if not isinstance(X, pd.Series):
-            X = pd.Series(X)
-        if not isinstance(Y, pd.Series):
-            Y = pd.Series(Y)
-        
-        # Create pairs of indices for alignment
-        Y_indices = Y[Y.notna()].index
-        X_indices = X[X.notna()].index
-        
-        # Calculate lagged indices
-        Y_start, Y_end = Y_indices.min(), Y_indices.max()
-        X_start, X_end = X_indices.min() + lag, X_indices.max() + lag
-        
-        # Find overlapping period
-        start_idx = max(Y_start, X_start)
-        end_idx = min(Y_end, X_end)
-        
-        # If no overlap after lag, return empty series
-        if start_idx > end_idx:
-            return pd.Series(), pd.Series()
+        values = np.asarray(series, dtype=float)
+        values = values[~np.isnan(values)]
+        key = self._diagnostics_key(values, d)
+        cls = PredictiveRegression
+        
+        with cls._diagnostics_cache_lock:
+            if key in cls._diagnostics_cache:
+                cls._diagnostics_cache.move_to_end(key)
+                cls._diagnostics_cache_stats['hits'] += 1
+                return dict(cls._diagnostics_cache[key])
+            cls._diagnostics_cache_stats['misses'] += 1
+        
+        entry = _stationarity_tests(np.diff(values, n=d) if d else values)
+        self._store_diagnostics(key, entry)
+        return dict(entry)
+
+    def _store_diagnostics(self, key, entry):
+        cls = PredictiveRegression
+        with cls._diagnostics_cache_lock:
+            cls._diagnostics_cache[key] = entry
+            cls._diagnostics_cache.move_to_end(key)
+            while len(cls._diagnostics_cache) > cls.diagnostics_cache_size:
+                cls._diagnostics_cache.popitem(last=False)
+
+    def precompute_diagnostics(self, df, columns=None, max_d=2, n_jobs=1):
+        """
+        Runs the stationarity tests for every column and differencing order
+        0..max_d in bulk, filling the diagnostics cache so later model fits
+        on the same series skip them.
         
-        # Align the series
-        Y_aligned = Y.loc[start_idx:end_idx]
-        X_aligned = X.loc[start_idx-lag:end_idx-lag]
+        Inputs:
+        df      : pandas DataFrame of yearly series
+        columns : columns to test (default: every numeric column)
+        max_d   : highest differencing order
+        n_jobs  : worker processes for the uncached tests (1 runs in-process,
+                  None or -1 uses every core)
         
-        # Get only points where both series have valid data
-        valid_indices = X_aligned.notna() & Y_aligned.notna()
-        return X_aligned[valid_indices], Y_aligned[valid_indices]
+        Outputs:
+        pandas DataFrame : one row per column and d with the test results
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=np.number).columns
+        
+        rows, pending = [], []
+        cls = PredictiveRegression
+        for column in columns:
+            values = df[column].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            for d in range(max_d + 1):
+                key = self._diagnostics_key(values, d)
+                with cls._diagnostics_cache_lock:
+                    entry = cls._diagnostics_cache.get(key)
+                    cls._diagnostics_cache_stats['misses' if entry is None else 'hits'] += 1
+                rows.append({'column': column, 'd': d, 'key': key, 'entry': entry})
+                if entry is None:
+                    pending.append((key, np.diff(values, n=d) if d else values))
+        
+        # Run each uncached test once, even if several columns share values
+        tasks = list({key: series for key, series in pending}.items())
+        results = self._map_parallel(_stationarity_tests, [(series,) for _, series in tasks], n_jobs=n_jobs)
+        computed = dict(zip([key for key, _ in tasks], results))
+        for key, entry in computed.items():
+            self._store_diagnostics(key, entry)
+        
+        return pd.DataFrame([
+            dict({'column': row['column'], 'd': row['d']}, **(row['entry'] or computed[row['key']]))
+            for row in rows
+        ])
 
-    def max_lag(self, X, Y, max_lag_years=6):
+    @classmethod
+    def diagnostics_cache_info(cls):
         """
-        Finds the lag that maximizes correlation between two time series.
+        Reports stationarity-diagnostics cache usage.
         
+        Outputs:
+        dict : {'hits', 'misses', 'size', 'maxsize'}
+        """
+        with cls._diagnostics_cache_lock:
+            return {
+                'hits': cls._diagnostics_cache_stats['hits'],
+                'misses': cls._diagnostics_cache_stats['misses'],
+                'size': len(cls._diagnostics_cache),
+                'maxsize': cls.diagnostics_cache_size
+            }
+
+    @classmethod
+    def clear_diagnostics_cache(cls):
+        """
+        Invalidates the stationarity-diagnostics cache and resets its counters.
+        """
+        with cls._diagnostics_cache_lock:
+            cls._diagnostics_cache.clear()
+            cls._diagnostics_cache_stats['hits'] = 0
+            cls._diagnostics_cache_stats['misses'] = 0
+
+    def lag_matrix(self, df, outputs=('faculty',), inputs=None, max_lag_years=6):
+        """
+        Runs the max_lag search for every (input, output) column pair of a
+        data frame in one broadcasted array operation.
+
         Inputs:
-        X             : yearly time series data
-        Y             : yearly time series data
+        df            : data frame with one column per series (e.g. data_interpolated.csv)
+        outputs       : list of target column names
+        inputs        : list of input column names (defaults to every other column)
         max_lag_years : maximum number of years to check for lag
-        
+
         Outputs:
-        tuple           : (optimal_lag, max_correlation, metrics)
-        optimal_lag     : lag that maximizes correlation
-        max_correlation : correlation value at optimal lag
-        metrics        : evaluation metrics at optimal lag
+        pd.DataFrame  : one row per (input, output) pair with columns
+            - input, output : column names
+            - lag           : lag that maximizes |correlation|
+            - correlation   : correlation at that lag
+            - n_points      : number of aligned points at that lag
+            - r2, rmse, mae, aic : metrics at that lag, as in max_lag
         """
         if max_lag_years < 0:
             raise ValueError("max_lag_years must be non-negative")
+
+        outputs = list(outputs)
+        if inputs is None:
+            inputs = [col for col in df.columns if col not in outputs]
+        inputs = list(inputs)
+
+        # Shared grid for all columns: (n_inputs, n) and (n_outputs, n)
+        frame = df[inputs + outputs]
+        index = frame.index
+        if pd.api.types.is_integer_dtype(index) and len(index) > 0:
+            frame = frame.reindex(pd.RangeIndex(index.min(), index.max() + 1))
+        x = frame[inputs].to_numpy(dtype=float).T
+        y = frame[outputs].to_numpy(dtype=float).T
+
+        # Correlograms for every pair at once: (n_inputs, n_outputs, max_lag + 1)
+        correlations, counts = self._correlogram(x[:, np.newaxis, :], y[np.newaxis, :, :], max_lag_years)
+
+        # Pairs without any valid correlation fall back to lag 0, as in max_lag
+        no_corr = np.all(np.isnan(correlations), axis=-1)
+        best_lag = np.argmax(np.nan_to_num(np.abs(correlations), nan=-1.0), axis=-1)
+        best_corr = np.take_along_axis(correlations, best_lag[..., np.newaxis], axis=-1)[..., 0]
+        best_corr = np.where(no_corr, 0.0, best_corr)
+        n_points = np.take_along_axis(counts, best_lag[..., np.newaxis], axis=-1)[..., 0]
+
+        # Raw lagged inputs at each pair's optimal lag: (n_inputs, n_outputs, n)
+        x_lagged = self._lag_windows(x, max_lag_years)
+        x_best = x_lagged[np.arange(len(inputs))[:, np.newaxis], best_lag]
+
+        # Metrics over the valid aligned points of each pair
+        metrics = self._calculate_metrics_batch(y[np.newaxis, :, :], x_best, n_params=1)
+
+        input_names, output_names = np.meshgrid(inputs, outputs, indexing='ij')
+        return pd.DataFrame({
+            'input': input_names.ravel(),
+            'output': output_names.ravel(),
+            'lag': best_lag.ravel(),
+            'correlation': best_corr.ravel(),
+            'n_points': n_points.ravel(),
+            'r2': metrics['r2'].ravel(),
+            'rmse': metrics['rmse'].ravel(),
+            'mae': metrics['mae'].ravel(),
+            'aic': metrics['aic'].ravel()
+        })
+
+    def _fold_r2(self, y_true, y_pred):
+        """
+        R-squared of one validation fold, following sklearn's r2_score
+        defaults (NaN for fewer than 2 points; 1 or 0 for a constant target)
+        without its input-validation overhead.
+        """
+        y_true = np.asarray(y_true, dtype=float)
+        y_pred = np.asarray(y_pred, dtype=float)
+        if len(y_true) != len(y_pred):
+            raise ValueError("Predictions and targets have different lengths")
+        if len(y_true) < 2:
+            return np.nan
+        rss = np.sum((y_true - y_pred) ** 2)
+        tss = np.sum((y_true - np.mean(y_true)) ** 2)
+        if tss == 0:
+            return 1.0 if rss == 0 else 0.0
+        return 1 - rss / tss
+
+    def _expanding_ols_predictions(self, design, Y, split):
+        """
+        Out-of-fold predictions of an OLS model for nested, expanding-window
+        folds from one QR-updating sweep over the training prefixes. The
+        triangular factor R of [design | Y] is carried from one window end
+        to the next and only the newly added rows are folded into it, so no
+        fold is refitted from scratch and no Gram matrix is formed (R has
+        the conditioning of the design itself). Each fold's coefficients are
+        pinv(R_design) @ R_Y, which equals statsmodels' pinv(design) @ Y on
+        that prefix, including its minimum-norm solution when a short window
+        leaves the design rank deficient.
         
-        # Initial data cleaning to get valid data points
-        X_clean, Y_clean = self.clean_series(X, Y)
-        
-        if len(X_clean) < 2 or len(Y_clean) < 2:
-            raise ValueError("Insufficient valid data points in series")
-        
-        # Convert to numpy arrays for computation
-        X_arr = np.array(X_clean)
-        Y_arr = np.array(Y_clean)
-        
-        # Standardize series
-        X_norm = (X_arr - np.mean(X_arr)) / (np.std(X_arr) + 1e-10)
-        Y_norm = (Y_arr - np.mean(Y_arr)) / (np.std(Y_arr) + 1e-10)
-        
-        # Try different lags and compute correlations
-        correlations = []
-        valid_lags = []
-        
-        for lag in range(max_lag_years + 1):
-            X_lagged, Y_aligned = self.align_with_lag(X_clean, Y_clean, lag)
-            if len(X_lagged) >= 2:  # Need at least 2 points for correlation
-                corr = np.corrcoef(X_lagged, Y_aligned)[0, 1]
-                if not np.isnan(corr):
-                    correlations.append(corr)
-                    valid_lags.append(lag)
-        
-        if not correlations:
-            # If no valid correlations found, return lag 0
-            X_aligned, Y_aligned = self.clean_series(X, Y)
-            return 0, 0, self._calculate_metrics(Y_aligned, X_aligned, n_params=1)
+        Inputs:
+        design : (n, p) design matrix for all aligned points
+        Y      : (n,) targets
+        split  : list of (train_idx, val_idx) with training windows starting at 0
         
-        # Find optimal lag
-        best_idx = np.argmax(np.abs(correlations))
-        optimal_lag = valid_lags[best_idx]
-        max_correlation = correlations[best_idx]
+        Outputs:
+        list   : predicted values for each validation window, in fold order
+        """
+        ends = [len(train_idx) for train_idx, _ in split]
+        for (train_idx, _), end in zip(split, ends):
+            if end == 0 or train_idx[0] != 0 or train_idx[-1] != end - 1:
+                raise ValueError("Expanding-window CV needs windows starting at 0")
+        if any(later < earlier for earlier, later in zip(ends, ends[1:])):
+            raise ValueError("Expanding-window CV needs non-decreasing training windows")
+        
+        design = np.asarray(design, dtype=float)
+        augmented = np.column_stack([design, Y])
+        p = design.shape[1]
+        
+        R = np.empty((0, p + 1))
+        start = 0
+        predictions = []
+        for end, (_, val_idx) in zip(ends, split):
+            # Fold the rows added since the last window end into R
+            R = np.linalg.qr(np.vstack([R, augmented[start:end]]), mode='r')
+            start = end
+            beta = np.linalg.pinv(R[:, :p]) @ R[:, p]
+            predictions.append(design[val_idx] @ beta)
+        return predictions
+
+    def _arima_rolling_predictions(self, X, Y, split, order):
+        """
+        Rolling-origin out-of-fold ARIMA forecasts from a single fit. The
+        model is estimated once on the first training window; every later
+        origin appends the new observations to the state-space results with
+        the parameters held fixed, so each fold costs a Kalman-filter pass
+        instead of a full maximum-likelihood fit.
         
-        # Calculate metrics at optimal lag
-        X_lagged, Y_aligned = self.align_with_lag(X, Y, optimal_lag)
-        metrics = self._calculate_metrics(Y_aligned, X_lagged, n_params=1)
+        Inputs:
+        X      : (n, k) exogenous inputs for all aligned points
+        Y      : (n,) targets
+        split  : list of (train_idx, val_idx) with training windows starting at 0
+        order  : (p, d, q) ARIMA order
         
-        return optimal_lag, max_correlation, metrics 
+        Outputs:
+        list   : predicted values for each validation window, in fold order
+        """
+        ends = [len(train_idx) for train_idx, _ in split]
+        for (train_idx, _), end in zip(split, ends):
+            if end == 0 or train_idx[0] != 0 or train_idx[-1] != end - 1:
+                raise ValueError("Rolling ARIMA CV needs expanding windows starting at 0")
+        if any(later < earlier for earlier, later in zip(ends, ends[1:])):
+            raise ValueError("Rolling ARIMA CV needs non-decreasing training windows")
+        
+        end = ends[0]
+        model = ARIMA(Y[:end], exog=X[:end], order=order).fit()
+        
+        predictions = []
+        for (_, val_idx), new_end in zip(split, ends):
+            # Filter forward through the observations added since the last origin
+            if new_end > end:
+                model = model.append(Y[end:new_end], exog=X[end:new_end])
+                end = new_end
+            
+            # Forecast across any gap up to the end of the validation window
+            stop = int(val_idx[-1]) + 1
+            forecast = model.forecast(steps=stop - end, exog=X[end:stop])
+            predictions.append(np.asarray(forecast).reshape(-1)[-len(val_idx):])
+        return predictions
 
-    def _do_cross_validation(self, X, Y, model_func, params, k_folds=5):
+    def _do_cross_validation(self, X, Y, model_func, params, k_folds=5, pooled=False,
+                             features=None, predictor=None):
         """
-        Helper function to perform cross validation for any model
+        Helper function to perform cross validation for any model.
+        Models that are linear in their parameters can pass `features` to be
+        scored by one QR-updating sweep over the expanding training windows
+        (see _expanding_ols_predictions), and models
+        that can roll a single fit forward can pass `predictor` (see
+        _arima_rolling_predictions); otherwise, or if that fails, each fold
+        is refitted with model_func. Folds run
+        in worker processes when the instance was created with n_jobs != 1
+        or an executor.
         Inputs:
-        X           : aligned X data for validation
-        Y           : aligned Y data for validation
+        X           : aligned X data for validation (array or Series, or a
+                      2-D array with one column per input)
+        Y           : aligned Y data for validation (array or Series)
         model_func  : model fitting function
         params      : dictionary of model parameters
         k_folds     : number of folds for CV
+        pooled      : whether to also return metrics pooled over all
+                      out-of-fold predictions
+        features    : optional function mapping X to the design matrix of an
+                      OLS model equivalent to model_func
+        predictor   : optional function mapping (X, Y, split) to the
+                      predictions of every validation window at once
         
         Outputs:
-        tuple       : (cv_score, cv_error)
+        tuple       : (cv_score, cv_error[, pooled_metrics])
         cv_score    : mean R2 score across folds
         cv_error    : standard deviation of R2 scores across folds
+        pooled_metrics : r2/rmse/mae/aic of the scored validation points
+                         taken together (only if pooled=True)
         """
-        # Initialize time series cross-validation
-        tscv = TimeSeriesSplit(n_splits=k_folds, test_size=max(2, len(X) // (k_folds + 1)))
+        # Work on arrays with one column per input; folds below are views into them
+        X = np.asarray(X, dtype=float)
+        X = X.reshape(len(X), -1)
+        Y = np.asarray(Y, dtype=float).reshape(-1)
+        
         val_scores = []
+        oof_metrics = MetricsAccumulator()
+        failed = (np.nan, np.nan, oof_metrics.result()) if pooled else (np.nan, np.nan)
         
         try:
-            for train_idx, val_idx in tscv.split(X):
+            # Split data into training and validation sets using the shared plan
+            plan = fold_plan(len(X), k_folds)
+            split = plan.split
+            folds = [(X[train], Y[train], X[val], Y[val]) for train, val in plan.slices]
+            
+            # Single-sweep path for linear-in-parameters models
+            outcomes = None
+            if features is not None:
                 try:
-                    # Split data into training and validation sets
-                    X_train = X.iloc[train_idx]
-                    Y_train = Y.iloc[train_idx]
-                    X_val = X.iloc[val_idx]
-                    Y_val = Y.iloc[val_idx]
-                    
-                    # Convert to numpy arrays if needed
-                    if isinstance(X_train, pd.Series):
-                        X_train = X_train.values
-                    if isinstance(Y_train, pd.Series):
-                        Y_train = Y_train.values
-                    if isinstance(X_val, pd.Series):
-                        X_val = X_val.values
-                    if isinstance(Y_val, pd.Series):
-                        Y_val = Y_val.values
-                    
-                    # Reshape arrays
-                    X_train = X_train.reshape(-1, 1)
-                    Y_train = Y_train.reshape(-1)
-                    X_val = X_val.reshape(-1, 1)
-                    Y_val = Y_val.reshape(-1)
-                    
-                    # Fit model
-                    if 'X' in params and 'Y' in params:
-                        model = model_func(**params)
-                    else:
-                        model = model_func(X=X_train, Y=Y_train)
-                    
-                    # Get predictions
-                    if hasattr(model, 'predict'):
-                        Y_pred = model.predict(X_val)
-                    elif callable(model):
-                        Y_pred = model(X_val)
+                    predictions = self._expanding_ols_predictions(features(X), Y, split)
+                    outcomes = [(Y_pred, None) for Y_pred in predictions]
+                except Exception:
+                    outcomes = None
+            
+            # Single-fit path for models rolled forward across origins
+            if outcomes is None and predictor is not None:
+                try:
+                    predictions = predictor(X, Y, split)
+                    outcomes = [(Y_pred, None) for Y_pred in predictions]
+                except Exception:
+                    outcomes = None
+            
+            # Fit folds in worker processes when configured; results come
+            # back in fold order either way
+            parallel = outcomes is None and (self.executor is not None or self.n_jobs != 1)
+            if parallel:
+                payload = cloudpickle.dumps((model_func, params))
+                outcomes = self._map_parallel(
+                    _cv_fold_pickled,
+                    [(payload,) + fold for fold in folds],
+                    n_jobs=self.n_jobs,
+                    executor=self.executor
+                )
+            
+            for i, (X_train, Y_train, X_val, Y_val) in enumerate(folds):
+                try:
+                    if outcomes is not None:
+                        Y_pred, error = outcomes[i]
+                        if error is not None:
+                            raise RuntimeError(error)
                     else:
-                        Y_pred = model.forecast(steps=len(val_idx), exog=X_val)
-                    
-                    # Handle array-like predictions
-                    Y_pred = np.array(Y_pred).reshape(-1)
-                    Y_val = np.array(Y_val).reshape(-1)
+                        Y_pred = _cv_fold(model_func, params, X_train, Y_train, X_val, Y_val)
                     
                     # Calculate R2 score for this fold
-                    fold_score = r2_score(Y_val, Y_pred)
+                    fold_score = self._fold_r2(Y_val, Y_pred)
                     if not np.isnan(fold_score):
                         val_scores.append(fold_score)
+                        oof_metrics.update(Y_val, Y_pred)
                         
                 except Exception as e:
                     print(f"Warning: Error in fold: {str(e)}")
                     continue
             
             if not val_scores:
-                return np.nan, np.nan
+                return failed
             
             # Calculate mean and standard deviation of scores
             cv_score = np.mean(val_scores)
             cv_error = np.std(val_scores)
             
+            if pooled:
+                return cv_score, cv_error, oof_metrics.result()
             return cv_score, cv_error
         
         except Exception as e:
             print(f"Error in cross-validation: {str(e)}")
-            return np.nan, np.nan
+            return failed
+    
+    def rolling_origin_evaluation(self, X, Y, method='linear_regression', horizon=5,
+                                  n_origins=10, n_jobs=1, **method_kwargs):
+        """
+        Rolling-origin evaluation of multi-step forecasts. Each origin refits
+        the method on the data up to that point only and forecasts horizons
+        1..horizon, which are scored as an (origin x horizon) matrix.
+        Methods that model Y[t] on X[t - L] (linear, polynomial, LOWESS and
+        GP regression) forecast Y[origin + h] from X[origin + h - L], using
+        the lag L selected at the origin, while h <= L; for h > L that X is
+        not yet observed, so the method is refitted directly on X[t - h]
+        (lag h) and evaluated at X[origin]. distributed_lag_regression, which
+        predicts Y[t] from X[t], X[t - 1], ..., is refitted with the target
+        advanced h periods. arima_regression and time_series_regression
+        forecast every horizon from a single fit per origin.
+        Inputs:
+        X             : yearly time series data (years for time_series_regression)
+        Y             : yearly time series data
+        method        : name of a PredictiveRegression method, e.g. 'arima_regression'
+        horizon       : largest forecast horizon H
+        n_origins     : number of most recent forecast origins
+        n_jobs        : worker processes for the fits (1 runs in-process, None
+                        or -1 uses every core); the instance's executor is used
+                        if it has one
+        method_kwargs : keyword arguments passed on to the method
+        
+        Outputs:
+        dict    : {
+            'forecasts' : pandas DataFrame of forecasts, origins x horizons,
+            'actuals'   : pandas DataFrame of observed values (NaN past the data),
+            'errors'    : pandas DataFrame of forecasts minus actuals,
+            'scores'    : pandas DataFrame of n, r2, rmse, mae per horizon
+        }
+        """
+        if horizon < 1 or n_origins < 1:
+            raise ValueError("horizon and n_origins must be at least 1")
+        if method.startswith('_') or method == 'rolling_origin_evaluation' \
+                or not callable(getattr(self, method, None)):
+            raise ValueError(f"Unknown regression method: {method}")
+        
+        X = pd.Series(X) if not isinstance(X, pd.Series) else X
+        Y = pd.Series(Y) if not isinstance(Y, pd.Series) else Y
+        
+        # Origins are the n_origins positions before the last observed Y
+        observed = np.flatnonzero(Y.notna().to_numpy())
+        if len(observed) == 0:
+            raise ValueError("Y has no observed values")
+        origins = np.arange(observed[-1] - n_origins, observed[-1])
+        if origins[0] <= observed[0]:
+            raise ValueError("Not enough observations before the first origin")
+        
+        # Observed value of Y at origin + h for every cell, NaN past the data
+        steps = np.arange(1, horizon + 1)
+        targets = origins[:, np.newaxis] + steps
+        y = np.append(Y.to_numpy(dtype=float), np.nan)
+        actual = y[np.minimum(targets, len(Y))]
+        
+        # One task per origin and horizon, or per origin for multi-step methods
+        multi_step = method in ('time_series_regression', 'arima_regression')
+        lagged = 'lag' in inspect.signature(getattr(self, method)).parameters
+        tasks = []
+        for origin in origins:
+            label = Y.index[origin]
+            X_train = X.loc[:label]
+            Y_train = Y.loc[:label]
+            if multi_step:
+                tasks.append((self, method, X_train, Y_train, horizon,
+                              dict(method_kwargs, horizon=horizon)))
+                continue
+            if not lagged:
+                for h in steps:
+                    tasks.append((self, method, X_train, Y_train.shift(-h), None, method_kwargs))
+                continue
+            
+            lag = method_kwargs.get('lag')
+            if lag is None:
+                try:
+                    lag = self._best_lag_alignment(X_train, Y_train).lag
+                except Exception:
+                    lag = 0
+            for h in steps:
+                # X[origin + h - lag] is the latest input the model needs;
+                # training pairs only use X up to origin - lag, so they are
+                # the same as with the full X_train
+                lag_h = max(lag, h)
+                X_h = X.loc[:Y.index[origin + h - lag_h]]
+                tasks.append((self, method, X_h, Y_train, None, dict(method_kwargs, lag=lag_h)))
+        
+        outcomes = self._map_parallel(_rolling_origin_task, tasks, n_jobs=n_jobs, executor=self.executor)
+        
+        forecast = np.full(actual.shape, np.nan)
+        per_origin = 1 if multi_step else horizon
+        for t, (values, error) in enumerate(outcomes):
+            i, j = divmod(t, per_origin)
+            if error is not None:
+                print(f"Warning: Error at origin {Y.index[origins[i]]}: {error}")
+                continue
+            if multi_step:
+                forecast[i, :len(values)] = values
+            else:
+                forecast[i, j] = values[0]
+        
+        # Forecasts that never change with the horizon mean the h-step
+        # targets collapsed onto one model
+        forecast_rows = forecast[~np.isnan(forecast).any(axis=1)]
+        if horizon > 1 and len(forecast_rows) and np.all(np.isclose(forecast_rows, forecast_rows[:, :1])):
+            print("Warning: Forecasts are identical at every horizon")
+        
+        # Score each horizon over the origins where it was observed and forecast
+        errors = forecast - actual
+        valid = ~np.isnan(errors)
+        n = valid.sum(axis=0)
+        sq_err = np.where(valid, errors ** 2, 0.0)
+        abs_err = np.where(valid, np.abs(errors), 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            y_mean = np.where(valid, actual, 0.0).sum(axis=0) / n
+            tss = np.where(valid, (actual - y_mean) ** 2, 0.0).sum(axis=0)
+            r2 = np.where(n >= 2, 1 - sq_err.sum(axis=0) / tss, np.nan)
+            rmse = np.sqrt(sq_err.sum(axis=0) / n)
+            mae = abs_err.sum(axis=0) / n
+        
+        origin_labels = pd.Index(Y.index[origins], name='origin')
+        horizon_labels = pd.Index(steps, name='horizon')
+        frame = lambda values: pd.DataFrame(values, index=origin_labels, columns=horizon_labels)
+        return {
+            'forecasts': frame(forecast),
+            'actuals': frame(actual),
+            'errors': frame(errors),
+            'scores': pd.DataFrame({'n': n, 'r2': r2, 'rmse': rmse, 'mae': mae}, index=horizon_labels)
+        }
     
-    def time_series_regression(self, X, Y, method='linear', do_cv=True, k_folds=5):
+    def time_series_regression(self, X, Y, method='linear', do_cv=True, k_folds=5, horizon=None):
         """
         Performs time series regression with trend and cyclical components.
         Cross validation is performed only on the trend component.
@@ -316,6 +2024,8 @@ class PredictiveRegression:
             method (str): Regression method ('linear', 'polynomial', 'lowess', 'arima', 'gaussian_process')
             do_cv (bool): Whether to perform cross-validation
             k_folds (int): Number of folds for cross-validation
+            horizon (int): Number of years to forecast past the last observation
+                (None forecasts through 2025)
         """
         # Convert X to yearly format and handle errors
         try:
@@ -332,15 +2042,15 @@ class PredictiveRegression:
         
         # Initialize storage for cross-validation
         cv_scores = []
+        oof_metrics = MetricsAccumulator()
         
         if do_cv:
-            tscv = TimeSeriesSplit(n_splits=k_folds)
-            for train_idx, test_idx in tscv.split(X_clean):
+            for train, test in fold_plan(len(X_clean), k_folds).slices:
                 # Split data
-                X_train = X_clean.iloc[train_idx]
-                Y_train = Y_clean.iloc[train_idx]
-                X_test = X_clean.iloc[test_idx]
-                Y_test = Y_clean.iloc[test_idx]
+                X_train = X_clean.iloc[train]
+                Y_train = Y_clean.iloc[train]
+                X_test = X_clean.iloc[test]
+                Y_test = Y_clean.iloc[test]
                 
                 if len(X_train) < 4:  # Minimum required for meaningful analysis
                     continue
@@ -352,13 +2062,16 @@ class PredictiveRegression:
                     score = r2_score(Y_test, trend_results['prediction'])
                     if not np.isnan(score):
                         cv_scores.append(score)
+                        oof_metrics.update(Y_test, trend_results['prediction'])
                 except Exception as e:
                     print(f"Warning: Error in fold: {str(e)}")
                     continue
         
-        # Fit on full dataset and predict through 2025
-        future_years = pd.Series(np.arange(float(X_clean.iloc[-1]) + 1, 2026),
-                            index=range(len(X_clean), len(X_clean) + int(2025 - X_clean.iloc[-1])))
+        # Fit on full dataset and predict through 2025 (or the requested horizon)
+        if horizon is None:
+            horizon = int(2025 - X_clean.iloc[-1])
+        future_years = pd.Series(float(X_clean.iloc[-1]) + np.arange(1, horizon + 1),
+                            index=range(len(X_clean), len(X_clean) + horizon))
         
         # Get final trend
         trend_results = self.trend_regression(X_clean, Y_clean, future_years, method)
@@ -406,7 +2119,8 @@ class PredictiveRegression:
         if do_cv and cv_scores:
             results.update({
                 'cv_score': np.mean(cv_scores),
-                'cv_error': np.std(cv_scores)
+                'cv_error': np.std(cv_scores),
+                'cv_pooled_r2': oof_metrics.result()['r2']
             })
         
         return results
@@ -534,35 +2248,154 @@ class PredictiveRegression:
             'prediction': pd.Series(predictions, index=X_pred.index)
         }
 
-    def linear_regression(self, X, Y, do_cv=True, k_folds=5):
+    def _scaled_lstsq(self, design, Y):
+        """
+        Least-squares coefficients for one design and any number of target
+        columns. Columns are scaled to unit norm before the solve, which
+        keeps raw polynomial features of large inputs (e.g. GDP ** 3)
+        well conditioned.
+        """
+        norms = np.linalg.norm(design, axis=0)
+        norms[norms == 0] = 1.0
+        coefs = np.linalg.lstsq(design / norms, Y, rcond=None)[0]
+        return coefs / (norms[:, np.newaxis] if coefs.ndim == 2 else norms)
+
+    def _multi_target_regression(self, method, X, Y, do_cv=True, k_folds=5, degree=2, frac=0.3,
+                                 lag=None):
+        """
+        Fits several targets against one input at once. The targets share
+        one lag scan and aligned X; linear and polynomial fits share a
+        single least-squares factorization with one column per target.
+        Inputs:
+        method  : 'linear', 'polynomial' or 'lowess'
+        X       : yearly time series data
+        Y       : DataFrame with one column per target
+        do_cv   : whether to perform cross validation
+        k_folds : number of folds for CV
+        degree  : polynomial degree (method='polynomial')
+        frac    : LOWESS sample fraction (method='lowess')
+        lag     : fixed lag to align at (default: the shared lag search)
+        
+        Outputs:
+        dict    : {target column: results dict as returned by the
+                   single-target method}
+        """
+        pair = self._best_lag_alignment(X, Y, lag=lag)
+        n_targets = pair.Y.shape[1]
+        current_X = X[2024 if 2024 in X.index else X.index.max()]
+        
+        if method in ('linear', 'polynomial'):
+            if method == 'linear':
+                n_params = 2
+                features = lambda x: np.column_stack([np.ones(len(x)), np.asarray(x).reshape(-1)])
+            else:
+                n_params = degree + 1
+                # Standardized basis, as in polynomial_regression
+                x_center, x_scale = pair.X.mean(), pair.X.std() + 1e-10
+                poly = PolynomialFeatures(degree)
+                features = lambda x: poly.fit_transform((np.asarray(x, dtype=float).reshape(-1, 1) - x_center) / x_scale)
+            
+            # One factorization of the shared design for every target
+            design = features(pair.X)
+            coefs = self._scaled_lstsq(design, pair.Y)
+            fitted = design @ coefs
+            if np.isnan(current_X):
+                predictions = np.full(n_targets, np.nan)
+            else:
+                predictions = (features([current_X]) @ coefs)[0]
+            metrics = self._calculate_metrics_batch(pair.Y.T, fitted.T, n_params=n_params)
+            aics = metrics['aic']
+            
+            def cv_model(X, Y):
+                beta = self._scaled_lstsq(features(X), Y)
+                return lambda X_new: features(X_new) @ beta
+        
+        elif method == 'lowess':
+            features = None
+            
+            # Sort the shared X once and reuse it for every target
+            order = np.argsort(pair.X, kind='stable')
+            x_sorted = pair.X[order]
+            fitted = np.empty(pair.Y.shape)
+            predictions = np.empty(n_targets)
+            for j in range(n_targets):
+                smoothed = lowess(pair.Y[order, j], x_sorted, frac=frac, is_sorted=True)
+                fitted[:, j] = np.interp(pair.X, smoothed[:, 0], smoothed[:, 1])
+                predictions[j] = np.interp(current_X, smoothed[:, 0], smoothed[:, 1])
+            n_params = max(1, int(frac * len(pair)))
+            metrics = self._calculate_metrics_batch(pair.Y.T, fitted.T, n_params=n_params)
+            aics = metrics['aic']
+            
+            def cv_model(X, Y):
+                smoothed_train = lowess(Y, X.ravel(), frac=frac, return_sorted=True)
+                return lambda X_new: np.interp(X_new.ravel(), smoothed_train[:, 0], smoothed_train[:, 1])
+        
+        else:
+            raise ValueError(f"Unsupported multi-target method: {method}")
+        
+        all_results = {}
+        for j, target in enumerate(Y.columns):
+            results = {
+                "lag": pair.lag,
+                "prediction": float(predictions[j]),
+                "r2": metrics["r2"][j],
+                "rmse": metrics["rmse"][j],
+                "mae": metrics["mae"][j],
+                "aic": aics[j],
+                "plot_data": pair.column(j).to_frame(Y_pred=fitted[:, j])
+            }
+            
+            if do_cv:
+                cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                    pair.X,
+                    pair.Y[:, j],
+                    cv_model,
+                    {},
+                    k_folds,
+                    pooled=True,
+                    features=features
+                )
+                results.update({
+                    'cv_score': cv_score,
+                    'cv_error': cv_error,
+                    'cv_pooled_r2': cv_pooled['r2']
+                })
+            
+            all_results[target] = results
+        
+        return all_results
+
+    def linear_regression(self, X, Y, do_cv=True, k_folds=5, lag=None):
         """
         Performs linear regression with optional cross validation.
+        Y may be a DataFrame or 2-D array with one column per target, in which
+        case all targets are fitted together and a dict of results per column
+        is returned.
+        A fixed lag skips the lag search.
         """
+        Y = self._as_targets(Y)
+        if isinstance(Y, pd.DataFrame):
+            return self._multi_target_regression('linear', X, Y, do_cv=do_cv, k_folds=k_folds, lag=lag)
+        
         # Find optimal lag and align series
-        best_lag, _, _ = self.max_lag(X, Y)
-        X_aligned, Y_aligned = self.align_with_lag(X, Y, best_lag)
+        pair = self._best_lag_alignment(X, Y, lag=lag)
         
         # Fit model
-        X_const = add_constant(X_aligned)
-        model = OLS(Y_aligned, X_const).fit()
+        X_const = add_constant(pair.X)
+        model = OLS(pair.Y, X_const).fit()
         
         # Make prediction
         current_X = X[2024 if 2024 in X.index else X.index.max()]
-        # Use iloc to avoid the deprecation warning
-        next_year_pred = model.params.iloc[0] + model.params.iloc[1] * current_X
+        next_year_pred = model.params[0] + model.params[1] * current_X
         
         # Create plot data
-        plot_data = pd.DataFrame({
-            'X': X_aligned,
-            'Y_data': Y_aligned,
-            'Y_pred': model.fittedvalues
-        })
+        plot_data = pair.to_frame(Y_pred=model.fittedvalues)
         
         # Calculate standardized metrics
-        metrics = self._calculate_metrics(Y_aligned, model.fittedvalues, n_params=2)
+        metrics = self._calculate_metrics(pair.Y, model.fittedvalues, n_params=2)
         
         results = {
-            "lag": best_lag,
+            "lag": pair.lag,
             "prediction": next_year_pred,
             "r2": metrics["r2"],
             "rmse": metrics["rmse"],
@@ -586,29 +2419,34 @@ class PredictiveRegression:
                 
                 return predict
             
-            cv_score, cv_error = self._do_cross_validation(
-                X_aligned, 
-                Y_aligned,
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                pair.X,
+                pair.Y,
                 ols_model,
                 {},
-                k_folds
+                k_folds,
+                pooled=True,
+                features=lambda X: add_constant(X.reshape(-1), has_constant='add')
             )
             results.update({
                 'cv_score': cv_score,
-                'cv_error': cv_error
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2']
             })
         
         return results
 
-    def polynomial_regression(self, X, Y, degree=2, do_cv=True, k_folds=5):
+    def polynomial_regression(self, X, Y, degree=2, do_cv=True, k_folds=5, lag=None):
         """
         Performs polynomial regression.
         Inputs:
         X       : yearly time series data 
-        Y       : yearly time series data
+        Y       : yearly time series data, or a DataFrame or 2-D array with one
+                  column per target (returns a dict of results per column)
         degree  : polynomial degree
         do_cv   : whether to perform cross validation
         k_folds : number of folds for CV
+        lag     : fixed lag to align at (default: the lag search picks it)
         
         Outputs:
         dict    : {
@@ -620,49 +2458,48 @@ class PredictiveRegression:
             'aic'       : Akaike Information Criterion,
             'plot_data' : pandas DataFrame with X, Y_pred, Y_data columns,
             'cv_score'  : mean validation score (if do_cv=True),
-            'cv_error'  : std of validation scores (if do_cv=True)
+            'cv_error'  : std of validation scores (if do_cv=True),
+            'cv_pooled_r2' : R-squared pooled over all validation points (if do_cv=True)
         }
         """
-        # Find optimal lag and align series
-        best_lag, _, _ = self.max_lag(X, Y)
-        X_aligned, Y_aligned = self.align_with_lag(X, Y, best_lag)
+        Y = self._as_targets(Y)
+        if isinstance(Y, pd.DataFrame):
+            return self._multi_target_regression(
+                'polynomial', X, Y, do_cv=do_cv, k_folds=k_folds, degree=degree, lag=lag
+            )
         
-        # Drop NaN values before fitting
-        valid_mask = ~np.isnan(X_aligned) & ~np.isnan(Y_aligned)
-        X_clean = X_aligned[valid_mask].values if hasattr(X_aligned, 'values') else X_aligned[valid_mask]
-        Y_clean = Y_aligned[valid_mask].values if hasattr(Y_aligned, 'values') else Y_aligned[valid_mask]
+        # Find optimal lag and align series
+        pair = self._best_lag_alignment(X, Y, lag=lag)
         
-        # Prepare polynomial features
-        X_array = X_clean.reshape(-1, 1)
+        # Polynomials of the standardized X span the same model space as
+        # raw powers with a far better conditioned design; the fit and the
+        # CV folds share this basis (aligned pairs contain no NaN values)
+        x_center, x_scale = pair.X.mean(), pair.X.std() + 1e-10
         poly = PolynomialFeatures(degree)
-        X_poly = poly.fit_transform(X_array)
+        features = lambda X: poly.fit_transform((np.asarray(X, dtype=float).reshape(-1, 1) - x_center) / x_scale)
+        X_poly = features(pair.X)
         
         # Fit model
-        model = OLS(Y_clean, X_poly).fit()
+        model = OLS(pair.Y, X_poly).fit()
         
         # Make prediction for next year
         current_X = X[2024 if 2024 in X.index else X.index.max()]
         if np.isnan(current_X):
             next_year_pred = np.nan
         else:
-            next_year_pred = model.predict(poly.transform([[current_X]]))[0]
+            next_year_pred = model.predict(features([current_X]))[0]
         
         # Get predictions for plotting
-        X_plot = X_array
-        Y_pred = model.predict(poly.transform(X_plot))
+        Y_pred = model.predict(X_poly)
         
         # Create plot data
-        plot_data = pd.DataFrame({
-            'X': X_aligned[valid_mask],
-            'Y_data': Y_aligned[valid_mask],
-            'Y_pred': Y_pred
-        })
+        plot_data = pair.to_frame(Y_pred=Y_pred)
         
         # Calculate metrics
-        metrics = self._calculate_metrics(Y_clean, Y_pred, n_params=degree + 1)
+        metrics = self._calculate_metrics(pair.Y, Y_pred, n_params=degree + 1)
         
         results = {
-            "lag": best_lag,
+            "lag": pair.lag,
             "prediction": next_year_pred,
             "r2": metrics["r2"],
             "rmse": metrics["rmse"],
@@ -682,10 +2519,8 @@ class PredictiveRegression:
                 X_valid = X[valid_mask].reshape(-1, 1)
                 Y_valid = Y[valid_mask]
                 
-                # Fit polynomial features
-                poly_cv = PolynomialFeatures(degree)
-                X_poly_cv = poly_cv.fit_transform(X_valid)
-                model_cv = OLS(Y_valid, X_poly_cv).fit()
+                # Fit on the same standardized polynomial basis
+                model_cv = OLS(Y_valid, features(X_valid)).fit()
                 
                 def predict(X_new):
                     X_new = np.asarray(X_new).reshape(-1)
@@ -693,62 +2528,251 @@ class PredictiveRegression:
                     valid_mask = ~np.isnan(X_new)
                     
                     if np.any(valid_mask):
-                        X_valid = X_new[valid_mask].reshape(-1, 1)
-                        X_poly_pred = poly_cv.transform(X_valid)
-                        predictions[valid_mask] = model_cv.predict(X_poly_pred)
+                        predictions[valid_mask] = model_cv.predict(features(X_new[valid_mask]))
                     
                     return predictions
                 
                 return predict
             
-            cv_score, cv_error = self._do_cross_validation(
-                X_aligned,
-                Y_aligned,
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                pair.X,
+                pair.Y,
                 poly_model,
                 {},
-                k_folds
+                k_folds,
+                pooled=True,
+                features=features
             )
             results.update({
                 'cv_score': cv_score,
-                'cv_error': cv_error
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2']
             })
         
         return results
     
-    def arima_regression(self, X, Y, max_p=3, max_d=2, max_q=3, do_cv=True, k_folds=5):
+    def _fit_arima_orders(self, Y, X, orders, budget, n_jobs=1, chunk_size=4, must_fit=False,
+                          per_fit_seconds=None):
+        """
+        Fits a batch of ARIMA orders with _arima_grid_chunk, in worker
+        processes when n_jobs != 1 or the instance has an executor.
+        Inputs:
+        Y, X       : aligned target and exogenous arrays
+        orders     : list of (p, d, q) orders
+        budget     : TimeBudget shared by the whole search
+        n_jobs     : worker processes (1 fits the batch in-process)
+        chunk_size : orders per worker task
+        must_fit   : whether the first successful fit completes even after
+                     the budget runs out
+        per_fit_seconds : optional time limit on each fit
+        
+        Outputs:
+        tuple      : (aics, statuses, best order, its fitted model), with
+                     the order and model None if nothing could be fitted
+        """
+        if n_jobs == 1 and self.executor is None:
+            chunk_size = max(len(orders), 1)
+        chunks = [orders[i:i + chunk_size] for i in range(0, len(orders), chunk_size)]
+        outcomes = self._map_parallel(
+            _arima_grid_chunk,
+            [(Y, X, chunk, budget.deadline, must_fit and i == 0, per_fit_seconds)
+             for i, chunk in enumerate(chunks)],
+            n_jobs=n_jobs,
+            executor=self.executor
+        )
+        
+        # Chunks come back in order, so strict comparison keeps the earliest
+        # order on ties, as in a sequential search
+        best_aic, best_order, best_model = np.inf, None, None
+        for chunk, (_, _, best, model, truncated) in zip(chunks, outcomes):
+            budget.truncated |= truncated
+            if best is not None and model.aic < best_aic:
+                best_aic, best_order, best_model = model.aic, chunk[best], model
+        
+        aics = np.concatenate([outcome[0] for outcome in outcomes]) if outcomes else np.array([])
+        statuses = [status for outcome in outcomes for status in outcome[1]]
+        return aics, statuses, best_order, best_model
+
+    def _search_arima_grid(self, Y, X, orders, budget, n_jobs=1, chunk_size=4, per_fit_seconds=None):
+        """
+        Searches the (p, d, q) grid for the lowest AIC, skipping orders that
+        cannot win. An order nested in the largest order with the same d,
+        (max_p, d, max_q), cannot reach a higher log-likelihood, so its AIC
+        is at least that model's AIC minus 2 per parameter it drops. These
+        largest orders are fitted first, and orders whose bound is above
+        the best AIC among them are pruned. If a fitted order beats its
+        bound, the largest fit stopped short of its maximum, and the orders
+        pruned with that d are fitted after all.
+        
+        Inputs:
+        Y, X   : aligned target and exogenous arrays
+        orders : (p, d, q) grid, in search order
+        budget, n_jobs, chunk_size, per_fit_seconds : as in _fit_arima_orders
+        
+        Outputs:
+        tuple  : (aics, statuses, best order, its fitted model) over the
+                 grid; pruned orders have status 'pruned' and AIC NaN
+        """
+        max_p = max(p for p, _, _ in orders)
+        max_q = max(q for _, _, q in orders)
+        position = {order: i for i, order in enumerate(orders)}
+        aics = np.full(len(orders), np.nan)
+        statuses = ['skipped'] * len(orders)
+        best_order, best_model = None, None
+        
+        def fit(batch):
+            nonlocal best_order, best_model
+            batch_aics, batch_statuses, order, model = self._fit_arima_orders(
+                Y, X, batch, budget, n_jobs=n_jobs, chunk_size=chunk_size,
+                must_fit=best_model is None, per_fit_seconds=per_fit_seconds
+            )
+            for order_, aic, status in zip(batch, batch_aics, batch_statuses):
+                aics[position[order_]] = aic
+                statuses[position[order_]] = status
+            # Ties go to the earlier order in the grid
+            if order is not None and (best_model is None or model.aic < best_model.aic or (
+                    model.aic == best_model.aic and position[order] < position[best_order])):
+                best_order, best_model = order, model
+        
+        largest = [order for order in orders if order[0] == max_p and order[2] == max_q]
+        fit(largest)
+        
+        # Lower bound on the AIC of each remaining order
+        largest_aic = {d: aics[position[(p, d, q)]] for p, d, q in largest}
+        def bound(order):
+            p, d, q = order
+            return largest_aic[d] - 2 * ((max_p - p) + (max_q - q))
+        
+        threshold = np.nanmin(list(largest_aic.values())) if best_model is not None else np.inf
+        rest = [order for order in orders if order not in largest]
+        pruned = [order for order in rest if bound(order) > threshold]
+        fit([order for order in rest if order not in pruned])
+        for order in pruned:
+            statuses[position[order]] = 'pruned'
+        
+        # Refit the pruned orders of any d whose bound a fitted order broke
+        broken = {order[1] for order in rest if aics[position[order]] < bound(order)}
+        recheck = [order for order in pruned if order[1] in broken]
+        if recheck:
+            fit(recheck)
+        return aics, statuses, best_order, best_model
+
+    def arima_regression(self, X, Y, max_p=3, max_d=2, max_q=3, do_cv=True, k_folds=5,
+                         cv_mode='extend', time_budget=None, n_jobs=1, chunk_size=4,
+                         search='grid', lag=None, horizon=None, per_fit_seconds=None, prune=True):
         """
         Performs ARIMA regression with simplified implementation.
+        cv_mode='extend' fits the selected order once and appends each
+        validation window to the fitted state-space model; cv_mode='refit'
+        refits the model on every training window.
+        time_budget caps the order search in seconds: once it runs out, the
+        fit in progress is abandoned, the best order so far is kept, cross
+        validation is skipped and the results carry truncated=True. The
+        first successful fit always completes so there is a model to
+        return. per_fit_seconds caps each fit on its own: a fit
+        that runs longer is abandoned with status 'timed out' and the
+        search moves on to the next order. With n_jobs != 1 (None or -1 uses every core) the order grid is fitted
+        in worker processes, chunk_size orders per task; the selected order
+        is the same as in the sequential search, ties going to the earlier
+        order. results['search'] lists the AIC of every order in the grid.
+        With prune=True the grid search skips orders whose AIC is bounded
+        below by that of the largest order with the same d (status
+        'pruned'); prune=False fits every order.
+        search='stepwise' replaces the exhaustive grid with the
+        Hyndman-Khandakar neighbourhood search: starting from the best of a
+        few seed orders, p, q and d move by one step at a time while the AIC
+        improves (each neighbourhood is fitted as one parallel batch).
+        results['n_fits'] counts the models fitted by either search.
+        A fixed lag skips the lag search.
+        Forecasts feed the model X[t - lag] as exogenous input where it is
+        observed and the last observed X after that. With a horizon,
+        results['forecasts'] holds the forecasts for 1..horizon periods
+        after the last aligned target.
         """
+        if cv_mode not in ('extend', 'refit'):
+            raise ValueError("cv_mode must be 'extend' or 'refit'")
+        if search not in ('grid', 'stepwise'):
+            raise ValueError("search must be 'grid' or 'stepwise'")
+        if np.ndim(Y) == 2:
+            raise ValueError("arima_regression fits a single target; pass one column of Y")
+        
         # Find optimal lag and align series
-        best_lag, _, _ = self.max_lag(X, Y)
-        X_aligned, Y_aligned = self.align_with_lag(X, Y, best_lag)
+        pair = self._best_lag_alignment(X, Y, lag=lag)
+        
+        # Reuse results stored by any earlier session
+        if self.model_cache is not None:
+            cache_key = self._model_cache_key('arima_regression', X, Y, pair.lag, {
+                'max_p': max_p, 'max_d': max_d, 'max_q': max_q, 'do_cv': do_cv,
+                'k_folds': k_folds, 'cv_mode': cv_mode, 'search': search,
+                'horizon': horizon, 'per_fit_seconds': per_fit_seconds, 'prune': prune
+            })
+            cached = self.model_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
-        # Convert to numpy arrays if needed
-        X_arr = X_aligned.values.reshape(-1, 1) if hasattr(X_aligned, 'values') else X_aligned.reshape(-1, 1)
-        Y_arr = Y_aligned.values if hasattr(Y_aligned, 'values') else Y_aligned
+        X_arr = pair.X.reshape(-1, 1)
+        Y_arr = pair.Y
         
-        # Determine minimum differencing order
-        d_min = 0 if adfuller(Y_arr)[1] < 0.05 else 1
+        # Determine minimum differencing order from the target as passed in,
+        # so the test is shared across inputs and lags
+        d_min = 0 if self.stationarity_diagnostics(Y)['adf_pvalue'] < 0.05 else 1
         
         # Find best ARIMA model
-        best_aic = np.inf
-        best_model = None
-        best_params = None
-        
-        # Grid search for parameters
-        for p, d, q in itertools.product(
-            range(max_p + 1),
-            range(d_min, max_d + 1),
-            range(max_q + 1)
-        ):
-            try:
-                model = ARIMA(Y_arr, exog=X_arr, order=(p, d, q)).fit()
-                if model.aic < best_aic:
-                    best_aic = model.aic
-                    best_model = model
-                    best_params = (p, d, q)
-            except:
-                continue
+        budget = TimeBudget(time_budget)
+        
+        if search == 'grid':
+            # Exhaustive grid, split into chunks for worker processes
+            orders = list(itertools.product(
+                range(max_p + 1),
+                range(d_min, max_d + 1),
+                range(max_q + 1)
+            ))
+            search_grid = self._search_arima_grid if prune else functools.partial(self._fit_arima_orders, must_fit=True)
+            aics, statuses, best_params, best_model = search_grid(
+                Y_arr, X_arr, orders, budget, n_jobs=n_jobs, chunk_size=chunk_size,
+                per_fit_seconds=per_fit_seconds
+            )
+        else:
+            # Hyndman-Khandakar stepwise search: fit the seed orders, then
+            # move to the best improving neighbour until none improves
+            def in_bounds(p, d, q):
+                return 0 <= p <= max_p and d_min <= d <= max_d and 0 <= q <= max_q
+            
+            seeds = [(2, d_min, 2), (0, d_min, 0), (1, d_min, 0), (0, d_min, 1)]
+            moves = [(1, 0, 0), (-1, 0, 0), (0, 0, 1), (0, 0, -1),
+                     (1, 0, 1), (1, 0, -1), (-1, 0, 1), (-1, 0, -1),
+                     (0, 1, 0), (0, -1, 0)]
+            batch = [order for order in seeds if in_bounds(*order)]
+            orders, aics, statuses = [], [], []
+            best_aic, best_params, best_model = np.inf, None, None
+            
+            while batch:
+                batch_aics, batch_statuses, order, model = self._fit_arima_orders(
+                    Y_arr, X_arr, batch, budget, n_jobs=n_jobs, chunk_size=chunk_size,
+                    must_fit=best_model is None, per_fit_seconds=per_fit_seconds
+                )
+                orders += batch
+                aics.append(batch_aics)
+                statuses += batch_statuses
+                
+                if order is None or not model.aic < best_aic:
+                    break
+                best_aic, best_params, best_model = model.aic, order, model
+                if budget.expired():
+                    budget.truncated = True
+                    break
+                
+                p, d, q = best_params
+                neighbours = [(p + dp, d + dd, q + dq) for dp, dd, dq in moves]
+                batch = [order for order in neighbours
+                         if in_bounds(*order) and order not in orders]
+            
+            aics = np.concatenate(aics) if aics else np.array([])
+        
+        search_table = pd.DataFrame(orders, columns=['p', 'd', 'q'])
+        search_table['aic'] = aics
+        search_table['status'] = statuses
+        n_fits = int(np.sum(~search_table['status'].isin(['skipped', 'pruned'])))
                 
         if best_model is None:
             raise ValueError("Could not fit any ARIMA model with given parameters")
@@ -756,36 +2780,46 @@ class PredictiveRegression:
         # Get fitted values
         Y_pred = best_model.fittedvalues
         
-        # Make prediction for next period
-        current_X = X_arr[-1]
+        # Exogenous inputs X[t - lag] for the periods after the last aligned
+        # target, carrying the last observed X past the end of the data
+        n_steps = 1 if horizon is None else int(horizon)
+        x_grid, _, grid_index = self._lag_grid(X, Y)
+        x_known = pd.Series(x_grid).ffill().to_numpy()
+        future = grid_index.get_loc(pair.index[-1]) + np.arange(1, n_steps + 1) - pair.lag
+        future_X = x_known[np.minimum(future, len(x_known) - 1)].reshape(-1, 1)
+        
+        # Make prediction for next period(s)
         try:
-            next_year_pred = best_model.forecast(steps=1, exog=np.array([[current_X]]))[0]
+            forecasts = np.asarray(best_model.forecast(steps=n_steps, exog=future_X), dtype=float)
         except:
-            next_year_pred = Y_pred[-1]  # Fallback to last fitted value
+            forecasts = np.full(n_steps, Y_pred[-1])  # Fallback to last fitted value
+        next_year_pred = forecasts[0]
         
         # Create plot data
-        plot_data = pd.DataFrame({
-            'X': X_aligned,
-            'Y_data': Y_aligned,
-            'Y_pred': Y_pred
-        })
+        plot_data = pair.to_frame(Y_pred=Y_pred)
         
         # Calculate metrics
         n_params = sum(best_params) + 1
-        metrics = self._calculate_metrics(Y_aligned, Y_pred, n_params=n_params)
+        metrics = self._calculate_metrics(pair.Y, Y_pred, n_params=n_params)
         
         results = {
-            "lag": best_lag,
+            "lag": pair.lag,
             "prediction": float(next_year_pred),
             "r2": metrics["r2"],
             "rmse": metrics["rmse"],
             "mae": metrics["mae"],
             "aic": metrics["aic"],
             "params": best_params,
+            "search": search_table,
+            "n_fits": n_fits,
             "plot_data": plot_data
         }
+        if horizon is not None:
+            results['forecasts'] = forecasts
+        if time_budget is not None:
+            results['truncated'] = budget.truncated or (do_cv and budget.expired())
         
-        if do_cv:
+        if do_cv and not results.get('truncated', False):
             def arima_model(X, Y):
                 # Fit ARIMA model with best parameters
                 X = X.reshape(-1, 1)
@@ -794,31 +2828,184 @@ class PredictiveRegression:
                 # Return simple prediction function
                 return lambda x: model.forecast(steps=len(x), exog=x.reshape(-1, 1))
             
-            cv_score, cv_error = self._do_cross_validation(
-                X_aligned,
-                Y_aligned,
+            predictor = None
+            if cv_mode == 'extend':
+                predictor = functools.partial(self._arima_rolling_predictions, order=best_params)
+            
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                pair.X,
+                pair.Y,
                 arima_model,
                 {},
-                k_folds
+                k_folds,
+                pooled=True,
+                predictor=predictor
+            )
+            results.update({
+                'cv_score': cv_score,
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2']
+            })
+        
+        # Results cut short by the time budget or a per-fit limit are not stored
+        timed_out = (search_table['status'] == 'timed out').any()
+        if self.model_cache is not None and not results.get('truncated', False) and not timed_out:
+            self.model_cache.put(cache_key, results)
+        
+        return results
+
+    def distributed_lag_regression(self, X, Y, max_lag_years=6, do_cv=True, k_folds=5):
+        """
+        Performs distributed-lag regression, regressing Y[t] on X[t], X[t-1],
+        ..., X[t-L] at the same time instead of on a single shifted X.
+        Every candidate L in 0..max_lag_years is fitted on the same rows from
+        one QR factorization and the candidate with the lowest AIC is kept.
+        Inputs:
+        X             : yearly time series data
+        Y             : yearly time series data
+        max_lag_years : largest lag included in the design matrix
+        do_cv         : whether to perform cross validation
+        k_folds       : number of folds for CV
+        
+        Outputs:
+        dict    : {
+            'lag'          : number of lags L in the selected model,
+            'prediction'   : predicted value for next period,
+            'r2'           : R-squared value,
+            'rmse'         : root mean square error,
+            'mae'          : mean absolute error,
+            'aic'          : Akaike Information Criterion,
+            'coefficients' : array of X coefficients for lags 0..L,
+            'models'       : pandas DataFrame with metrics of every candidate L,
+            'plot_data'    : pandas DataFrame with X, Y_pred, Y_data columns,
+            'cv_score'     : mean validation score (if do_cv=True),
+            'cv_error'     : std of validation scores (if do_cv=True),
+            'cv_pooled_r2' : R-squared pooled over all validation points (if do_cv=True)
+        }
+        """
+        if max_lag_years < 0:
+            raise ValueError("max_lag_years must be non-negative")
+        if np.ndim(Y) == 2:
+            raise ValueError("distributed_lag_regression fits a single target; pass one column of Y")
+        
+        x, y, index = self._lag_grid(X, Y)
+        if len(y) <= max_lag_years:
+            raise ValueError("Series are shorter than max_lag_years")
+        
+        # Lagged design matrix as a strided view: column l holds x[t - l]
+        X_lags = sliding_window_view(x, max_lag_years + 1)[:, ::-1]
+        Y_target = y[max_lag_years:]
+        labels = np.asarray(index[max_lag_years:])
+        
+        # Keep rows where every lag and the target are observed, so all
+        # candidate models are fitted (and compared) on the same sample
+        valid = ~np.isnan(X_lags).any(axis=1) & ~np.isnan(Y_target)
+        n_obs = int(np.count_nonzero(valid))
+        if n_obs < max_lag_years + 3:
+            raise ValueError("Insufficient valid data points for distributed lag regression")
+        X_lags, Y_fit, labels = X_lags[valid], Y_target[valid], labels[valid]
+        
+        # Standardize X for conditioning; all columns share one scale
+        x_mean, x_std = X_lags.mean(), X_lags.std() + 1e-10
+        design = np.column_stack([np.ones(n_obs), (X_lags - x_mean) / x_std])
+        
+        # Candidate L uses the first L + 2 columns (intercept and lags 0..L).
+        # Those share the leading block of a single QR factorization, so all
+        # candidates are solved as one batch of triangular systems, padded
+        # with the identity where a candidate has no coefficient.
+        Q, R = np.linalg.qr(design)
+        qty = Q.T @ Y_fit
+        n_cols = max_lag_years + 2
+        sizes = np.arange(2, n_cols + 1)
+        active = np.arange(n_cols)[np.newaxis, :] < sizes[:, np.newaxis]
+        R_batch = np.where(active[:, :, np.newaxis] & active[:, np.newaxis, :], R, np.eye(n_cols))
+        rhs = np.where(active, qty, 0.0)
+        coefs = np.linalg.solve(R_batch, rhs[..., np.newaxis])[..., 0]
+        fitted = coefs @ design.T
+        
+        # Score every candidate at once
+        candidate_metrics = self._calculate_metrics_batch(Y_fit, fitted, n_params=sizes)
+        models = pd.DataFrame({
+            'lag': np.arange(max_lag_years + 1),
+            'n_params': sizes,
+            'r2': candidate_metrics['r2'],
+            'rmse': candidate_metrics['rmse'],
+            'mae': candidate_metrics['mae'],
+            'aic': candidate_metrics['aic']
+        })
+        best = int(np.argmin(candidate_metrics['aic']))
+        
+        # Coefficients on the original X scale
+        lag_coefs = coefs[best, 1:best + 2] / x_std
+        intercept = coefs[best, 0] - np.sum(lag_coefs) * x_mean
+        Y_pred = fitted[best]
+        
+        # Make prediction from the most recent X values
+        recent_X = x[len(x) - 1 - np.arange(best + 1)]
+        next_year_pred = intercept + lag_coefs @ recent_X
+        
+        # Create plot data against the unlagged X
+        pair = AlignedPair(X_lags[:, 0], Y_fit, labels, lag=best)
+        plot_data = pair.to_frame(Y_pred=Y_pred)
+        
+        # Calculate metrics
+        metrics = self._calculate_metrics(Y_fit, Y_pred, n_params=best + 2)
+        
+        results = {
+            "lag": best,
+            "prediction": float(next_year_pred),
+            "r2": metrics["r2"],
+            "rmse": metrics["rmse"],
+            "mae": metrics["mae"],
+            "aic": metrics["aic"],
+            "coefficients": lag_coefs,
+            "models": models,
+            "plot_data": plot_data
+        }
+        
+        if do_cv:
+            def dl_model(X, Y):
+                X_const = np.column_stack([np.ones(len(X)), X])
+                beta = np.linalg.lstsq(X_const, Y, rcond=None)[0]
+                
+                def predict(X_new):
+                    return np.column_stack([np.ones(len(X_new)), X_new]) @ beta
+                
+                return predict
+            
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                X_lags[:, :best + 1],
+                Y_fit,
+                dl_model,
+                {},
+                k_folds,
+                pooled=True
             )
             results.update({
                 'cv_score': cv_score,
-                'cv_error': cv_error
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2']
             })
         
         return results
 
-    def lowess_regression(self, X, Y, frac=0.3, do_cv=True, k_folds=5):
+    def lowess_regression(self, X, Y, frac=0.3, do_cv=True, k_folds=5, lag=None):
         """
         Performs LOWESS regression with proper vector handling.
+        Y may be a DataFrame or 2-D array with one column per target, in which
+        case a dict of results per column is returned. A fixed lag skips the
+        lag search.
         """
+        Y = self._as_targets(Y)
+        if isinstance(Y, pd.DataFrame):
+            return self._multi_target_regression('lowess', X, Y, do_cv=do_cv, k_folds=k_folds, frac=frac,
+                                                 lag=lag)
+        
         # Find optimal lag and align series
-        best_lag, _, _ = self.max_lag(X, Y)
-        X_aligned, Y_aligned = self.align_with_lag(X, Y, best_lag)
+        pair = self._best_lag_alignment(X, Y, lag=lag)
         
-        # Convert to numpy arrays if needed
-        X_arr = X_aligned.values if hasattr(X_aligned, 'values') else X_aligned
-        Y_arr = Y_aligned.values if hasattr(Y_aligned, 'values') else Y_aligned
+        X_arr = pair.X
+        Y_arr = pair.Y
         
         # Fit LOWESS model
         smoothed = lowess(
@@ -839,26 +3026,22 @@ class PredictiveRegression:
         X_sorted_idx = np.argsort(X_arr)
         Y_pred = np.interp(X_arr, smoothed[:, 0], smoothed[:, 1])
         
-        plot_data = pd.DataFrame({
-            'X': X_aligned,
-            'Y_data': Y_aligned,
-            'Y_pred': Y_pred
-        })
+        plot_data = pair.to_frame(Y_pred=Y_pred)
         
         # Calculate effective parameters (degrees of freedom)
         n = len(X_arr)
         effective_params = max(1, int(frac * n))
         
         # Calculate metrics
-        metrics = self._calculate_metrics(Y_aligned, Y_pred, n_params=effective_params)
+        metrics = self._calculate_metrics(Y_arr, Y_pred, n_params=effective_params)
         
         results = {
-            "lag": best_lag,
+            "lag": pair.lag,
             "prediction": float(next_year_pred),
             "r2": metrics["r2"],
             "rmse": metrics["rmse"],
             "mae": metrics["mae"],
-            "aic": self._calculate_non_parametric_aic(Y_aligned, Y_pred, effective_params),
+            "aic": self._calculate_non_parametric_aic(Y_arr, Y_pred, effective_params),
             "plot_data": plot_data
         }
         
@@ -878,21 +3061,89 @@ class PredictiveRegression:
                 
                 return predict
             
-            cv_score, cv_error = self._do_cross_validation(
-                X_aligned,
-                Y_aligned,
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                pair.X,
+                pair.Y,
                 lowess_model,
                 {},
-                k_folds
+                k_folds,
+                pooled=True
             )
             results.update({
                 'cv_score': cv_score,
-                'cv_error': cv_error
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2']
             })
         
         return results
 
-    def gaussian_process_regression(self, X, Y, length_scale=1.0, do_cv=True, k_folds=5):
+    def _gp_analytic_cv(self, kernel, X, y, y_scale=1.0, k_folds=5, level=0.95):
+        """
+        Exact leave-one-out (LOO) and leave-future-out (LFO) predictive
+        distributions of a zero-mean Gaussian process with a fixed kernel,
+        all from one Cholesky factorization K = L L^T of the kernel matrix.
+        LOO uses K^-1: the mean is y_i - [K^-1 y]_i / [K^-1]_ii and the variance
+        is 1 / [K^-1]_ii. For time-ordered points, y = L e with standard normal
+        innovations e, so the one-step-ahead prediction of y_i from y_0..y_i-1
+        has mean y_i - L_ii e_i and standard deviation L_ii.
+        Inputs:
+        kernel  : fitted kernel, including its WhiteKernel noise term
+        X       : (n, 1) array of scaled inputs in time order
+        y       : scaled targets in time order
+        y_scale : factor returning y to original units
+        k_folds : points in the first training window of fold_plan(n, k_folds)
+                  are not scored by LFO
+        level   : central predictive interval used for calibration
+        
+        Outputs:
+        dict    : {
+            'cv_loo_r2', 'cv_lfo_r2'             : R-squared of the predictive means,
+            'cv_loo_nlpd', 'cv_lfo_nlpd'         : mean negative log predictive
+                                                   density in original units,
+            'cv_loo_coverage', 'cv_lfo_coverage' : share of points inside the
+                                                   central level predictive interval
+        }
+        """
+        y = np.asarray(y, dtype=float).reshape(-1)
+        n = len(y)
+        L = cholesky(kernel(X), lower=True)
+        L_inv = solve_triangular(L, np.eye(n), lower=True)
+        innovations = L_inv @ y
+        
+        # Leave-one-out from the inverse kernel matrix
+        K_inv_diag = np.sum(L_inv ** 2, axis=0)
+        alpha = L_inv.T @ innovations
+        loo_mean = y - alpha / K_inv_diag
+        loo_std = 1.0 / np.sqrt(K_inv_diag)
+        
+        # Leave-future-out from the innovations
+        lfo_mean = y - np.diag(L) * innovations
+        lfo_std = np.diag(L)
+        
+        z_crit = norm.ppf(0.5 + level / 2)
+        
+        def scores(y_true, mean, std):
+            y_true, mean, std = y_true * y_scale, mean * y_scale, std * y_scale
+            z = (y_true - mean) / std
+            nlpd = np.mean(0.5 * np.log(2 * np.pi * std ** 2) + 0.5 * z ** 2)
+            r2 = self._calculate_metrics(y_true, mean)['r2'] if len(y_true) >= 2 else np.nan
+            return r2, nlpd, np.mean(np.abs(z) <= z_crit)
+        
+        start = max(len(fold_plan(n, k_folds).split[0][0]), 1)
+        loo = scores(y, loo_mean, loo_std)
+        lfo = scores(y[start:], lfo_mean[start:], lfo_std[start:])
+        return {
+            'cv_loo_r2': loo[0],
+            'cv_loo_nlpd': loo[1],
+            'cv_loo_coverage': loo[2],
+            'cv_lfo_r2': lfo[0],
+            'cv_lfo_nlpd': lfo[1],
+            'cv_lfo_coverage': lfo[2]
+        }
+
+    def gaussian_process_regression(self, X, Y, length_scale=1.0, do_cv=True, k_folds=5,
+                                    cv_mode='refit', cv_maxiter=10, time_budget=None,
+                                    approximation='exact', n_inducing=64, n_jobs=1, lag=None):
         """
         Performs Gaussian Process Regression.
         Inputs:
@@ -901,6 +3152,30 @@ class PredictiveRegression:
         length_scale : RBF kernel length scale parameter
         do_cv        : whether to perform cross validation
         k_folds      : number of folds for CV
+        cv_mode      : how each CV fold obtains its kernel hyperparameters:
+                       'refit' re-optimizes from the initial kernel,
+                       'fixed' reuses the hyperparameters fitted on the full data,
+                       'warm'  starts the optimizer from the full-data fit and
+                               runs at most cv_maxiter iterations without restarts,
+                       'analytic' computes exact leave-one-out and
+                               leave-future-out predictions at the full-data
+                               hyperparameters from one Cholesky factorization
+                               (see _gp_analytic_cv) instead of fitting folds;
+                               it needs approximation='exact'
+        cv_maxiter   : optimizer iteration cap per fold when cv_mode='warm'
+        time_budget  : optional cap in seconds on the hyperparameter search;
+                       once it runs out, the optimizer keeps its best iterate,
+                       remaining restarts and cross validation are skipped
+                       and the results carry truncated=True
+        approximation : 'exact' fits scikit-learn's GaussianProcessRegressor,
+                        O(n^3) per likelihood evaluation; 'sparse' fits an
+                        inducing-point GP at O(n m^2), for long or monthly series;
+                        on the annual data its predictions agree with the
+                        exact GP to within 1%, not exactly
+        n_inducing   : number of inducing points m when approximation='sparse'
+        n_jobs       : worker processes for the optimizer starts (1 runs them
+                       in-process, None or -1 uses every core)
+        lag          : fixed lag to align at (default: the lag search picks it)
         
         Outputs:
         dict    : {
@@ -913,21 +3188,47 @@ class PredictiveRegression:
             'std'       : prediction standard deviation,
             'plot_data' : pandas DataFrame with X, Y_pred, Y_data columns,
             'cv_score'  : mean validation score (if do_cv=True),
-            'cv_error'  : std of validation scores (if do_cv=True)
+            'cv_error'  : std of validation scores (if do_cv=True),
+            'cv_pooled_r2' : R-squared pooled over all validation points (if do_cv=True),
+            'cv_loo_r2', 'cv_loo_nlpd', 'cv_loo_coverage',
+            'cv_lfo_r2', 'cv_lfo_nlpd', 'cv_lfo_coverage' : R-squared, negative
+                          log predictive density and 95% interval coverage of
+                          the leave-one-out and leave-future-out predictions
+                          (instead of the three above if cv_mode='analytic'),
+            'cv_time'   : wall time of the cross validation in seconds (if do_cv=True),
+            'cv_time_saved' : estimated seconds saved against cv_mode='refit'
+                              (if do_cv=True and cv_mode is not 'refit'),
+            'truncated' : whether the time budget cut the fit short
+                          (if time_budget is set)
         }
         """
-        # Find optimal lag and align series
-        best_lag, _, _ = self.max_lag(X, Y)
-        X_aligned, Y_aligned = self.align_with_lag(X, Y, best_lag)
+        if cv_mode not in ('refit', 'fixed', 'warm', 'analytic'):
+            raise ValueError("cv_mode must be 'refit', 'fixed', 'warm' or 'analytic'")
+        if approximation not in ('exact', 'sparse'):
+            raise ValueError("approximation must be 'exact' or 'sparse'")
+        if approximation == 'sparse' and cv_mode == 'analytic':
+            # The closed form needs the dense O(n^3) kernel factorization
+            raise ValueError("cv_mode='analytic' requires approximation='exact'")
+        if np.ndim(Y) == 2:
+            raise ValueError("gaussian_process_regression fits a single target; pass one column of Y")
         
-        # Drop NaN values before fitting
-        valid_mask = ~np.isnan(X_aligned) & ~np.isnan(Y_aligned)
-        X_clean = X_aligned[valid_mask].values if hasattr(X_aligned, 'values') else X_aligned[valid_mask]
-        Y_clean = Y_aligned[valid_mask].values if hasattr(Y_aligned, 'values') else Y_aligned[valid_mask]
+        # Find optimal lag and align series
+        pair = self._best_lag_alignment(X, Y, lag=lag)
+        
+        # Reuse results stored by any earlier session
+        if self.model_cache is not None:
+            cache_key = self._model_cache_key('gaussian_process_regression', X, Y, pair.lag, {
+                'length_scale': length_scale, 'do_cv': do_cv, 'k_folds': k_folds,
+                'cv_mode': cv_mode, 'cv_maxiter': cv_maxiter,
+                'approximation': approximation, 'n_inducing': n_inducing
+            })
+            cached = self.model_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
-        # Reshape data
-        X_fit = X_clean.reshape(-1, 1)
-        Y_fit = Y_clean.reshape(-1)
+        # Reshape data (aligned pairs contain no NaN values)
+        X_fit = pair.X.reshape(-1, 1)
+        Y_fit = pair.Y
         
         # Scale the data
         def robust_scale(data):
@@ -943,14 +3244,48 @@ class PredictiveRegression:
         X_scaled, X_median, X_iqr = robust_scale(X_fit)
         Y_scaled, Y_median, Y_iqr = robust_scale(Y_fit)
         
-        # Define kernel and fit model
+        budget = TimeBudget(time_budget)
+        
+        def make_gpr(kernel, optimizer="fmin_l_bfgs_b", n_restarts_optimizer=0):
+            if approximation == 'sparse':
+                return SparseGaussianProcessRegressor(
+                    kernel=kernel,
+                    n_inducing=n_inducing,
+                    optimizer=optimizer,
+                    n_restarts_optimizer=n_restarts_optimizer,
+                    random_state=42
+                )
+            return GaussianProcessRegressor(
+                kernel=kernel,
+                optimizer=optimizer,
+                random_state=42,
+                n_restarts_optimizer=n_restarts_optimizer,
+                normalize_y=False
+            )
+        
+        # Define kernel
         kernel = RBF(length_scale=length_scale) + WhiteKernel(noise_level=0.1)
-        gpr = GaussianProcessRegressor(
-            kernel=kernel,
-            random_state=42,
-            n_restarts_optimizer=5,
-            normalize_y=False
+        n_restarts = 5
+        
+        # Optimizer starts: the initial kernel, then restarts drawn
+        # log-uniformly from the bounds by the generator scikit-learn would
+        # seed from random_state=42, so results do not depend on n_jobs
+        bounds = kernel.bounds
+        rng = np.random.RandomState(42)
+        starts = [kernel.theta] + [rng.uniform(bounds[:, 0], bounds[:, 1]) for _ in range(n_restarts)]
+        optima = self._map_parallel(
+            _gp_optimizer_start,
+            [(make_gpr(kernel), X_scaled, Y_scaled, theta, budget.deadline) for theta in starts],
+            n_jobs=n_jobs,
+            executor=self.executor
         )
+        budget.truncated = any(truncated for _, _, truncated, _ in optima)
+        start_times = [seconds for _, _, _, seconds in optima]
+        
+        # Fit the model at the start with the best log-marginal-likelihood
+        # (the earliest start on ties, as in scikit-learn)
+        best_theta = max(optima, key=lambda optimum: optimum[1])[0]
+        gpr = make_gpr(kernel.clone_with_theta(best_theta), optimizer=None)
         gpr.fit(X_scaled, Y_scaled)
         
         def predict_scaled(X_new, scaler_params):
@@ -982,26 +3317,21 @@ class PredictiveRegression:
         scaler_params = {'X': (X_median, X_iqr), 'Y': (Y_median, Y_iqr)}
         current_X = X[2024 if 2024 in X.index else X.index.max()]
         next_year_pred, next_year_std = predict_scaled(np.array([current_X]), scaler_params)
-        Y_pred, Y_std = predict_scaled(X_aligned.values, scaler_params)
+        Y_pred, Y_std = predict_scaled(pair.X, scaler_params)
         
         # Create plot data
-        plot_data = pd.DataFrame({
-            'X': X_aligned,
-            'Y_data': Y_aligned,
-            'Y_pred': Y_pred,
-            'Y_std': Y_std
-        })
+        plot_data = pair.to_frame(Y_pred=Y_pred, Y_std=Y_std)
         
         # Calculate metrics using only non-NaN values
-        valid_metrics = ~np.isnan(Y_pred) & ~np.isnan(Y_aligned)
+        valid_metrics = ~np.isnan(Y_pred)
         metrics = self._calculate_metrics(
-            Y_aligned[valid_metrics], 
+            pair.Y[valid_metrics], 
             Y_pred[valid_metrics], 
             n_params=len(gpr.kernel_.theta)
         )
         
         results = {
-            "lag": best_lag,
+            "lag": pair.lag,
             "prediction": float(next_year_pred[0]),
             "r2": metrics["r2"],
             "rmse": metrics["rmse"],
@@ -1010,8 +3340,20 @@ class PredictiveRegression:
             "std": float(next_year_std[0]),
             "plot_data": plot_data
         }
-        
-        if do_cv:
+        if time_budget is not None:
+            results['truncated'] = budget.truncated or (do_cv and budget.expired())
+        
+        if do_cv and not results.get('truncated', False) and cv_mode == 'analytic':
+            cv_start = time.perf_counter()
+            results.update(self._gp_analytic_cv(gpr.kernel_, X_scaled, Y_scaled, Y_iqr + 1e-8, k_folds))
+            results['cv_time'] = time.perf_counter() - cv_start
+        elif do_cv and not results.get('truncated', False):
+            def warm_optimizer(obj_func, initial_theta, bounds):
+                # Short L-BFGS-B run from the full-data optimum
+                opt = minimize(obj_func, initial_theta, method="L-BFGS-B", jac=True,
+                               bounds=bounds, options={'maxiter': cv_maxiter})
+                return opt.x, opt.fun
+            
             def cv_gpr_model(X, Y):
                 # Ensure X and Y are numpy arrays
                 X = np.asarray(X).reshape(-1)
@@ -1026,11 +3368,14 @@ class PredictiveRegression:
                 X_scaled, X_median, X_iqr = robust_scale(X_valid)
                 Y_scaled, Y_median, Y_iqr = robust_scale(Y_valid)
                 
-                cv_gpr = GaussianProcessRegressor(
-                    kernel=kernel.clone_with_theta(kernel.theta),
-                    random_state=42,
-                    normalize_y=False
-                )
+                if cv_mode == 'refit':
+                    cv_gpr = make_gpr(kernel.clone_with_theta(kernel.theta))
+                else:
+                    # Start from the hyperparameters fitted on the full data
+                    cv_gpr = make_gpr(
+                        gpr.kernel_.clone_with_theta(gpr.kernel_.theta),
+                        optimizer=None if cv_mode == 'fixed' else warm_optimizer
+                    )
                 cv_gpr.fit(X_scaled.reshape(-1, 1), Y_scaled)
                 
                 def predict(X_new):
@@ -1048,16 +3393,30 @@ class PredictiveRegression:
                 
                 return predict
             
-            cv_score, cv_error = self._do_cross_validation(
-                X_aligned,
-                Y_aligned,
+            cv_start = time.perf_counter()
+            cv_score, cv_error, cv_pooled = self._do_cross_validation(
+                pair.X,
+                pair.Y,
                 cv_gpr_model,
                 {},
-                k_folds
+                k_folds,
+                pooled=True
             )
+            cv_time = time.perf_counter() - cv_start
             results.update({
                 'cv_score': cv_score,
-                'cv_error': cv_error
+                'cv_error': cv_error,
+                'cv_pooled_r2': cv_pooled['r2'],
+                'cv_time': cv_time
             })
         
+        if 'cv_time' in results and cv_mode != 'refit':
+            # A refit fold costs about one optimizer start on the full data
+            refit_estimate = np.mean(start_times) * len(fold_plan(len(pair), k_folds))
+            results['cv_time_saved'] = max(refit_estimate - results['cv_time'], 0.0)
+        
+        # Results cut short by the time budget are not stored
+        if self.model_cache is not None and not results.get('truncated', False):
+            self.model_cache.put(cache_key, results)
+        
         return results
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis_classes as analysis
+
+
+def make_lagged_pair(n=60, lag=2, n_targets=1, seed=0):
+    # Y[t] = a * X[t - lag] + b exactly, on a yearly index
+    rng = np.random.default_rng(seed)
+    index = pd.RangeIndex(1960, 1960 + n)
+    x = pd.Series(np.cumsum(rng.normal(1.0, 1.0, n)), index=index)
+    columns = {f'y{j}': (j + 2.0) * x.shift(lag) + 5.0 * j for j in range(n_targets)}
+    return x, pd.DataFrame(columns, index=index)
+
+
+def test_2d_array_targets_take_the_multi_target_path():
+    x, Y = make_lagged_pair(n_targets=2)
+    model = analysis.PredictiveRegression()
+    X = x.reset_index(drop=True)
+    from_frame = model.linear_regression(X, Y.reset_index(drop=True), do_cv=False)
+    from_array = model.linear_regression(X, Y.to_numpy(), do_cv=False)
+    assert list(from_array) == [0, 1]
+    for column, key in zip(Y.columns, from_array):
+        assert from_array[key]['lag'] == from_frame[column]['lag']
+        assert from_array[key]['prediction'] == pytest.approx(from_frame[column]['prediction'])
+
+
+def test_single_target_methods_reject_2d_targets():
+    x, Y = make_lagged_pair(n_targets=2)
+    model = analysis.PredictiveRegression()
+    for method in ('arima_regression', 'gaussian_process_regression', 'distributed_lag_regression'):
+        with pytest.raises(ValueError, match='single target'):
+            getattr(model, method)(x, Y.to_numpy())
+
+
+def test_expanding_ols_sweep_matches_per_fold_refits():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=80)
+    design = np.column_stack([np.ones_like(x), x, x ** 2, x ** 3])
+    y = design @ [1.0, -2.0, 0.5, 0.3] + rng.normal(scale=0.1, size=80)
+    split = analysis.fold_plan(len(x), 5).split
+    model = analysis.PredictiveRegression()
+    swept = model._expanding_ols_predictions(design, y, split)
+    for (train_idx, val_idx), predictions in zip(split, swept):
+        beta = np.linalg.pinv(design[train_idx]) @ y[train_idx]
+        np.testing.assert_allclose(predictions, design[val_idx] @ beta, rtol=1e-10)
+
+
+@pytest.mark.parametrize('method', ['linear_regression', 'polynomial_regression'])
+def test_rolling_origin_is_exact_at_every_horizon_of_a_lag_process(method):
+    # Y[t] = 2 * X[t - 3] + 5, so horizons 1..3 are exactly predictable
+    x, Y = make_lagged_pair(n=60, lag=3)
+    evaluation = analysis.PredictiveRegression().rolling_origin_evaluation(
+        x, Y['y0'], method=method, horizon=3, n_origins=6)
+    errors = evaluation['errors'].to_numpy()
+    assert np.isfinite(errors).any(axis=0).all()
+    assert np.nanmax(np.abs(errors)) < 1e-6 * np.nanmax(np.abs(Y['y0']))
+
+
+def test_arima_per_fit_limit_abandons_slow_fits_but_keeps_searching():
+    x, Y = make_lagged_pair(n=40, lag=1)
+    Y = Y['y0'] + np.random.default_rng(2).normal(size=40)
+    results = analysis.PredictiveRegression().arima_regression(
+        x, Y, max_p=1, max_d=1, max_q=1, do_cv=False, lag=1, per_fit_seconds=1e-9)
+    statuses = results['search']['status']
+    # The first fit always completes; every later fit hits its own limit
+    assert (statuses == 'fitted').sum() == 1
+    assert (statuses[statuses != 'fitted'] == 'timed out').all()
+    assert not results.get('truncated', False)
+
+
+def test_pruned_arima_grid_selects_the_exhaustive_order():
+    x, Y = make_lagged_pair(n=50, lag=1)
+    Y = Y['y0'] + np.random.default_rng(3).normal(scale=2.0, size=50).cumsum()
+    model = analysis.PredictiveRegression()
+    kwargs = dict(max_p=2, max_d=2, max_q=2, do_cv=False, lag=1)
+    pruned = model.arima_regression(x, Y, prune=True, **kwargs)
+    exhaustive = model.arima_regression(x, Y, prune=False, **kwargs)
+    assert pruned['params'] == exhaustive['params']
+    assert pruned['aic'] == exhaustive['aic']
+    assert (pruned['search']['status'] == 'pruned').any()
+    assert pruned['n_fits'] < exhaustive['n_fits']
+
+
+
+@pytest.mark.parametrize('column', ['GDP', 'CPI_inflation'])
+def test_sparse_gp_matches_exact_gp_on_faculty_data(column):
+    # With fewer points than inducing points the sparse bound nearly equals
+    # the exact likelihood; the optimizers stop at slightly different
+    # hyperparameters, so predictions agree to within 1%
+    df = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_interpolated.csv'))
+    model = analysis.PredictiveRegression()
+    exact = model.gaussian_process_regression(df[column], df['faculty'], do_cv=False)
+    sparse = model.gaussian_process_regression(df[column], df['faculty'], do_cv=False,
+                                               approximation='sparse')
+    assert sparse['prediction'] == pytest.approx(exact['prediction'], rel=1e-2)
+    assert sparse['std'] == pytest.approx(exact['std'], rel=1e-2)
+    assert sparse['r2'] == pytest.approx(exact['r2'], abs=1e-4)